@@ -1,15 +1,16 @@
+import argparse
+import multiprocessing
 import shutil
-import subprocess
 import sys
 import os
-from pathlib import Path
 from dataclasses import dataclass
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_text_frame import render_text_frame
+
 FPS = 8
 BASE_FRAMES_DIR = "frames_kq6"
 OUTPUT_DIR = "games_assets/kq6/opening_frames"
-SCRIPT_DIR = Path(__file__).resolve().parent
-GENERATE_TEXT_FRAME = SCRIPT_DIR / "generate_text_frame.py"
 
 @dataclass
 class Subtitle:
@@ -19,6 +20,11 @@ class Subtitle:
     y_position: int = 75
 
 
+def render_frame(kwargs):
+    """Pool worker: render one frame with render_text_frame(**kwargs)."""
+    return render_text_frame(**kwargs)
+
+
 def generate_subtitle_frames(
     text,
     start_frame,
@@ -36,9 +42,12 @@ def generate_subtitle_frames(
     y_position=20,
     use_base_frames=True,
     use_fade=False,
-    set_border=False
+    set_border=False,
+    pool=None
 ):
+    """Render frames start_frame..end_frame, in `pool` (a multiprocessing.Pool) if given."""
     total = end_frame - start_frame + 1
+    frames = []
 
     for i, frame_num in enumerate(range(start_frame, end_frame + 1)):
         if not use_fade:
@@ -54,76 +63,95 @@ def generate_subtitle_frames(
         else:
             base_frame_path = None
 
-        cmd = [
-            sys.executable, str(GENERATE_TEXT_FRAME),
-            "--width",      str(width),
-            "--height",     str(height),
-            "--font",       font,
-            "--font-size",  str(font_size),
-            "--font-color", font_color,
-            "--background", background,
-            "--margin",     str(margin),
-            "--y-position", str(y_position),
-            "--text",       text,
-            "--output",     output_path,
-            "--fade",       str(fade),
-        ]
-
-        if base_frame_path is not None:
-            cmd += ["--base-frame", base_frame_path]
-
-        if font_color_index is not None:
-            cmd += ["--font-color-index", str(font_color_index)]
-
-        if set_border:
-            cmd += ["--set-border"]
+        frame = dict(
+            output=output_path,
+            width=width,
+            height=height,
+            font=font,
+            font_size=font_size,
+            text=text,
+            margin=margin,
+            font_color=font_color,
+            font_color_index=font_color_index,
+            y_position=y_position,
+            background=background,
+            fade=fade,
+            base_frame=base_frame_path,
+            set_border=set_border,
+        )
 
         print(f"Frame {frame_num:04d}  fade={fade:3d}")
-        subprocess.run(cmd, check=True)
+        frames.append(frame)
 
+    if pool is not None:
+        pool.map(render_frame, frames)
+    else:
+        for frame in frames:
+            render_frame(frame)
 
 
+def run(pool=None):
+    """Build the opening movie frames; subtitle frames are rendered in `pool` if given."""
+    # ---- Copy frames 70-950 from base folder to output folder ----
+    for frame_num in range(70, 951):
+        src = os.path.join(BASE_FRAMES_DIR, f"frame_{frame_num:04d}.png")
+        dst = os.path.join(OUTPUT_DIR, f"frame_{frame_num:04d}.png")
+        shutil.copy2(src, dst)
+    print("Copied frames 70-950 from base folder to output folder.")
 
-# ---- Copy frames 70-950 from base folder to output folder ----
-for frame_num in range(70, 951):
-    src = os.path.join(BASE_FRAMES_DIR, f"frame_{frame_num:04d}.png")
-    dst = os.path.join(OUTPUT_DIR, f"frame_{frame_num:04d}.png")
-    shutil.copy2(src, dst)
-print("Copied frames 70-950 from base folder to output folder.")
-
-# ---- First subtitle (outside loop) ----
-generate_subtitle_frames(
-    text="לפני זמן רב, בטירתה של ממלכה בשם דבנטרי...",
-    start_frame=1,
-    end_frame=60,
-    font_size=20,
-    y_position=68,
-    use_base_frames=False,
-    use_fade=True,
-)
-
-# ---- Subtitle definitions ----
-subtitles = [
-    Subtitle(message="אלכסנדר! הנה אתה!", start_second=12, end_second=14.5),
-    Subtitle(message="אתה עדיין חושב על קסימה, נכון?", start_second=14.5, end_second=19),
-    Subtitle(message="המממ? אני מניח שכן.", start_second=19, end_second=21),
-    Subtitle(message="בני, עברו חודשים. אתה חייב להתאושש.", start_second=21, end_second=25),
-    Subtitle(message="אחרי הכל, פגשת אותה רק פעם אחת...", start_second=25, end_second=28),
-    Subtitle(message="אני יודע.", start_second=28, end_second=29),
-]
-
-for sub in subtitles:
+    # ---- First subtitle (outside loop) ----
     generate_subtitle_frames(
-        text=sub.message,
-        start_frame=round(sub.start_second * FPS) + 1,
-        end_frame=round(sub.end_second * FPS),
-        font="arial.ttf",
-        font_size=12,
-        font_color="#ffffff",
-        font_color_index=255,
-        y_position=sub.y_position,
-        use_base_frames=True,
-        set_border=True,
+        text="לפני זמן רב, בטירתה של ממלכה בשם דבנטרי...",
+        start_frame=1,
+        end_frame=60,
+        font_size=20,
+        y_position=68,
+        use_base_frames=False,
+        use_fade=True,
+        pool=pool,
     )
 
-
+    # ---- Subtitle definitions ----
+    subtitles = [
+        Subtitle(message="אלכסנדר! הנה אתה!", start_second=12, end_second=14.5),
+        Subtitle(message="אתה עדיין חושב על קסימה, נכון?", start_second=14.5, end_second=19),
+        Subtitle(message="המממ? אני מניח שכן.", start_second=19, end_second=21),
+        Subtitle(message="בני, עברו חודשים. אתה חייב להתאושש.", start_second=21, end_second=25),
+        Subtitle(message="אחרי הכל, פגשת אותה רק פעם אחת...", start_second=25, end_second=28),
+        Subtitle(message="אני יודע.", start_second=28, end_second=29),
+    ]
+
+    for sub in subtitles:
+        generate_subtitle_frames(
+            text=sub.message,
+            start_frame=round(sub.start_second * FPS) + 1,
+            end_frame=round(sub.end_second * FPS),
+            font="arial.ttf",
+            font_size=12,
+            font_color="#ffffff",
+            font_color_index=255,
+            y_position=sub.y_position,
+            use_base_frames=True,
+            set_border=True,
+            pool=pool,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Hebrew subtitle frames of the KQ6 opening movie.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Render frames in N worker processes (0 = one per CPU, default: 1)")
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    pool = multiprocessing.Pool(jobs) if jobs > 1 else None
+    try:
+        run(pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+if __name__ == "__main__":
+    main()
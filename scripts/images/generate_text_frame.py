@@ -10,13 +10,24 @@ Usage:
         --margin 20
         --text "Your message here"
         --output output.png
+
+Can also be imported: render_text_frame() draws one frame in-process.
+Each text is wrapped, BiDi-reordered and rasterised into coverage masks
+once; every further frame of the same subtitle (each fade level, each
+base frame) only pastes its colour through those masks.  Quantizing to a
+base frame's palette goes through a lookup table built once per palette
+(when NumPy is installed).
 """
 
 import argparse
 import sys
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from bidi.algorithm import get_display
 
+LINE_SPACING = 4
+BORDER_OFFSETS = [(-1,-1),(0,-1),(1,-1),(-1,0),(1,0),(-1,1),(0,1),(1,1)]
+
 
 def wrap_text(text, font, max_width, draw):
     words = text.split()
@@ -40,41 +51,132 @@ def wrap_text(text, font, max_width, draw):
     return lines
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate a text PNG frame at 8-bit depth.')
-    parser.add_argument('--width',       type=int, required=True,  help='Image width in pixels')
-    parser.add_argument('--height',      type=int, required=True,  help='Image height in pixels')
-    parser.add_argument('--font',        type=str, required=True,  help='Path to .ttf font file')
-    parser.add_argument('--font-size',   type=int, required=True,  help='Font size in points')
-    parser.add_argument('--font-color',       type=str, required=False, default=None, help='Text color (name or #RRGGBB)')
-    parser.add_argument('--font-color-index',  type=int, default=None,  help='Palette index to use as font color (when using --base-frame)')
-    parser.add_argument('--margin',      type=int, required=True,  help='Horizontal margin in pixels (left and right)')
-    parser.add_argument('--y-position',  type=int, default=0,      help='Y position in pixels where text drawing starts (default: 0)')
-    parser.add_argument('--text',        type=str, required=True,  help='Text message to draw')
-    parser.add_argument('--output',      type=str, required=True,  help='Output PNG file path')
-    parser.add_argument('--background',  type=str, default='black', help='Background color (default: black)')
-    parser.add_argument('--fade',         type=int, default=0,       help='Fade 0-100: 0=no fade, 100=fully faded to background color')
-    parser.add_argument('--base-frame',   type=str, default=None,    help='Optional base PNG frame to draw text on top of (preserves its palette)')
-    parser.add_argument('--set-border',   action='store_true',        help='Draw a black 1-pixel border around each letter')
+@lru_cache(maxsize=None)
+def load_font(font_path, font_size):
+    """Load a TrueType font once per (path, size); fall back to Pillow's default font."""
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except (IOError, OSError):
+        print(f"Warning: Could not load font '{font_path}', using default font.")
+        return ImageFont.load_default()
 
-    args = parser.parse_args()
 
-    if args.base_frame:
-        base = Image.open(args.base_frame).convert('RGB')
-        img = base.resize((args.width, args.height))
-        base_palette_img = Image.open(args.base_frame).convert('P')
+@lru_cache(maxsize=256)
+def layout_text(text, font_path, font_size, max_text_width):
+    """
+    Return (line_height, [(visual_line, text_width), ...]) for `text`
+    wrapped to max_text_width, each line already in BiDi display order.
+    """
+    font = load_font(font_path, font_size)
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+    lines = wrap_text(text, font, max_text_width, draw)
+    # Apply BiDi algorithm for correct RTL visual rendering
+    lines = [get_display(line) for line in lines]
+
+    # Measure line height from a reference string
+    ref_bbox = draw.textbbox((0, 0), 'Ag', font=font)
+    line_height = ref_bbox[3] - ref_bbox[1]
+
+    measured = []
+    for line in lines:
+        bbox = draw.textbbox((0, 0), line, font=font)
+        measured.append((line, bbox[2] - bbox[0]))
+    return line_height, tuple(measured)
+
+
+@lru_cache(maxsize=64)
+def rasterise_text(text, font_path, font_size, width, height, margin, y_position):
+    """
+    Coverage masks of `text` laid out in a width × height frame: a tuple
+    of (left, top, mask) per line, each mask an 'L' image cropped to the
+    line's glyphs plus one pixel on every side, so the same mask also
+    serves for the border offsets.
+    """
+    font = load_font(font_path, font_size)
+    max_text_width = width - 2 * margin
+    line_height, lines = layout_text(text, font_path, font_size, max_text_width)
+
+    masks = []
+    y = y_position - (len(lines) - 1) * font_size
+    for line, text_width in lines:
+        x = margin + (max_text_width - text_width) // 2
+        # One pixel larger than the frame on every side: glyph pixels just
+        # outside it still reach it through the border offsets.
+        canvas = Image.new('L', (width + 2, height + 2), 0)
+        ImageDraw.Draw(canvas).text((x + 1, y + 1), line, font=font, fill=255)
+        bbox = canvas.getbbox()
+        if bbox:
+            masks.append((bbox[0] - 1, bbox[1] - 1, canvas.crop(bbox)))
+        y += line_height + LINE_SPACING
+    return tuple(masks)
+
+
+@lru_cache(maxsize=4)
+def palette_lut(palette):
+    """
+    Lookup table (64³ entries, indexed by the top 6 bits of R, G and B) of
+    the palette index Image.quantize(dither=0) picks for each colour;
+    None without NumPy.  Pillow answers its nearest-colour search from a
+    cache of the same 4×4×4 cells, so the table reproduces it exactly.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    palette_img = Image.new('P', (1, 1))
+    palette_img.putpalette(list(palette))
+    cells = np.arange(64 * 64 * 64, dtype=np.uint32)
+    rgb = np.empty((cells.size, 3), dtype=np.uint8)
+    rgb[:, 0] = (cells >> 12) << 2
+    rgb[:, 1] = ((cells >> 6) & 63) << 2
+    rgb[:, 2] = (cells & 63) << 2
+    cube = Image.frombytes('RGB', (512, 512), rgb.tobytes())
+    return np.frombuffer(cube.quantize(palette=palette_img, dither=0).tobytes(), dtype=np.uint8)
+
+
+def quantize_to_palette(img, palette_img):
+    """Same result as img.quantize(palette=palette_img, dither=0) for an RGB image."""
+    lut = palette_lut(tuple(palette_img.getpalette()))
+    if lut is None:
+        return img.quantize(palette=palette_img, dither=0)
+
+    import numpy as np
+    rgb = np.asarray(img).reshape(-1, 3) >> 2
+    cell = rgb[:, 0].astype(np.uint32)
+    cell <<= 6
+    cell |= rgb[:, 1]
+    cell <<= 6
+    cell |= rgb[:, 2]
+    out = Image.frombytes('P', img.size, lut.take(cell).tobytes())
+    out.putpalette(palette_img.palette)
+    return out
+
+
+def render_text_frame(output, width, height, font, font_size, text, margin,
+                      font_color=None, font_color_index=None, y_position=0,
+                      background='black', fade=0, base_frame=None, set_border=False):
+    """
+    Draw `text` into a width × height frame and save it to `output` as an
+    8-bit palettised PNG.  Takes the same settings as the command line.
+    Raises ValueError if neither a font colour nor a usable palette index
+    is given.
+    """
+    if base_frame:
+        with Image.open(base_frame) as base:
+            img = base.convert('RGB').resize((width, height))
+            base_palette_img = base.convert('P')
     else:
-        img = Image.new('RGB', (args.width, args.height), color=args.background)
+        img = Image.new('RGB', (width, height), color=background)
         base_palette_img = None
-    draw = ImageDraw.Draw(img)
 
     # Determine font color — from palette index or RGB value
-    if base_palette_img is not None and args.font_color_index is not None:
+    if base_palette_img is not None and font_color_index is not None:
         pal = base_palette_img.getpalette()
-        idx = args.font_color_index
-        if args.font_color is not None:
+        idx = font_color_index
+        if font_color is not None:
             # Override the palette entry at font_color_index with the given font_color
-            fc_rgb = Image.new('RGB', (1, 1), color=args.font_color).getpixel((0, 0))
+            fc_rgb = Image.new('RGB', (1, 1), color=font_color).getpixel((0, 0))
             pal[idx * 3]     = fc_rgb[0]
             pal[idx * 3 + 1] = fc_rgb[1]
             pal[idx * 3 + 2] = fc_rgb[2]
@@ -83,47 +185,22 @@ def main():
             fc_rgb = (pal[idx * 3], pal[idx * 3 + 1], pal[idx * 3 + 2])
         blended_color = fc_rgb  # no fade when using palette index
     else:
-        if args.font_color is None:
-            print("ERROR: --font-color or --font-color-index is required.")
-            sys.exit(1)
+        if font_color is None:
+            raise ValueError("--font-color or --font-color-index is required.")
         bg_rgb = img.getpixel((0, 0))
-        fc_rgb = Image.new('RGB', (1, 1), color=args.font_color).getpixel((0, 0))
-        t = max(0, min(100, args.fade)) / 100.0
+        fc_rgb = Image.new('RGB', (1, 1), color=font_color).getpixel((0, 0))
+        t = max(0, min(100, fade)) / 100.0
         blended_color = tuple(int(fc + (bg - fc) * t) for fc, bg in zip(fc_rgb, bg_rgb))
 
-    try:
-        font = ImageFont.truetype(args.font, args.font_size)
-    except (IOError, OSError):
-        print(f"Warning: Could not load font '{args.font}', using default font.")
-        font = ImageFont.load_default()
-
-    max_text_width = args.width - 2 * args.margin
-
-    lines = wrap_text(args.text, font, max_text_width, draw)
-    # Apply BiDi algorithm for correct RTL visual rendering
-    lines = [get_display(line) for line in lines]
-
-    # Measure line height from a reference string
-    ref_bbox = draw.textbbox((0, 0), 'Ag', font=font)
-    line_height = ref_bbox[3] - ref_bbox[1]
-    line_spacing = 4
-
-    x_start = args.margin
-    y = args.y_position - (len(lines) - 1) * args.font_size
-
-    for line in lines:
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_width = bbox[2] - bbox[0]
-        x = x_start + (max_text_width - text_width) // 2
-        if args.set_border:
-            for dx, dy in [(-1,-1),(0,-1),(1,-1),(-1,0),(1,0),(-1,1),(0,1),(1,1)]:
-                draw.text((x + dx, y + dy), line, font=font, fill=(0, 0, 0))
-        draw.text((x, y), line, font=font, fill=blended_color)
-        y += line_height + line_spacing
+    for left, top, mask in rasterise_text(text, font, font_size, width, height, margin, y_position):
+        if set_border:
+            for dx, dy in BORDER_OFFSETS:
+                img.paste((0, 0, 0), (left + dx, top + dy), mask)
+        img.paste(blended_color, (left, top), mask)
 
     if base_palette_img is not None:
         # Preserve the original frame's palette
-        img_8bit = img.quantize(palette=base_palette_img, dither=0)
+        img_8bit = quantize_to_palette(img, base_palette_img)
     else:
         # Build an explicit palette with index 0 = black, index 1 = text color
         # so ScummVM margins stay black.
@@ -135,7 +212,39 @@ def main():
         palette_img.putpalette(explicit_palette)
         img_8bit = img.quantize(palette=palette_img, dither=0)
 
-    img_8bit.save(args.output, bits=8)
+    img_8bit.save(output, bits=8)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a text PNG frame at 8-bit depth.')
+    parser.add_argument('--width',       type=int, required=True,  help='Image width in pixels')
+    parser.add_argument('--height',      type=int, required=True,  help='Image height in pixels')
+    parser.add_argument('--font',        type=str, required=True,  help='Path to .ttf font file')
+    parser.add_argument('--font-size',   type=int, required=True,  help='Font size in points')
+    parser.add_argument('--font-color',       type=str, required=False, default=None, help='Text color (name or #RRGGBB)')
+    parser.add_argument('--font-color-index',  type=int, default=None,  help='Palette index to use as font color (when using --base-frame)')
+    parser.add_argument('--margin',      type=int, required=True,  help='Horizontal margin in pixels (left and right)')
+    parser.add_argument('--y-position',  type=int, default=0,      help='Y position in pixels where text drawing starts (default: 0)')
+    parser.add_argument('--text',        type=str, required=True,  help='Text message to draw')
+    parser.add_argument('--output',      type=str, required=True,  help='Output PNG file path')
+    parser.add_argument('--background',  type=str, default='black', help='Background color (default: black)')
+    parser.add_argument('--fade',         type=int, default=0,       help='Fade 0-100: 0=no fade, 100=fully faded to background color')
+    parser.add_argument('--base-frame',   type=str, default=None,    help='Optional base PNG frame to draw text on top of (preserves its palette)')
+    parser.add_argument('--set-border',   action='store_true',        help='Draw a black 1-pixel border around each letter')
+
+    args = parser.parse_args()
+
+    try:
+        render_text_frame(
+            args.output, args.width, args.height, args.font, args.font_size, args.text,
+            args.margin, font_color=args.font_color, font_color_index=args.font_color_index,
+            y_position=args.y_position, background=args.background, fade=args.fade,
+            base_frame=args.base_frame, set_border=args.set_border,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
     print(f"Saved: {args.output}")
 
 
@@ -0,0 +1,133 @@
+"""
+bench_lzs.py – compare LZS compressor backends on real Robot frames.
+
+Decodes a sample of frames from one or more .rbt files, compresses every
+cel with each available LZSEncoder backend (and each requested level),
+checks that parse_rbt's LZSDecompressor gives back the original pixels
+(and that edge cases such as empty input match the python backend),
+and reports size, ratio, compression and decompression throughput per
+backend and level.
+
+Usage:
+    python bench_lzs.py <file.rbt> [<file.rbt> ...] [options]
+
+Options:
+    --frames N         Number of frames to sample per file, evenly spaced
+                       (default: 8)
+    --backends LIST    Comma-separated backends (default: all available)
+    --levels LIST      Comma-separated LZS levels to compare (default: 0)
+
+Example:
+    python scripts/robot/bench_lzs.py games_assets/kq7/911.RBT --frames 4
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from encode_rbt import LZSEncoder, available_lzs_backends, resolve_lzs_backend
+from parse_rbt import LZSDecompressor, RobotFile
+
+
+def sample_cels(rbt_path: str, count: int):
+    """Return the decoded pixel buffers of `count` evenly spaced frames."""
+    with RobotFile(rbt_path) as rbt:
+        if not len(rbt):
+            return []
+        step = max(1, len(rbt) // max(1, count))
+        cels = []
+        for fr in rbt[:step * count:step]:
+            cels += [c.pixels for c in fr.cels if c.pixels]
+    return cels
+
+
+# Inputs no sampled frame covers; every backend must compress them to the
+# same bytes as the python backend and round-trip them.
+EDGE_CASES = [b'']
+
+
+def check_edge_cases(backend: str, level: int) -> bool:
+    """True if `backend` handles every EDGE_CASES input like the python backend."""
+    for pixels in EDGE_CASES:
+        try:
+            out = LZSEncoder(backend, level).compress(pixels)
+        except Exception:
+            return False
+        if (out != LZSEncoder('python', level).compress(pixels)
+                or LZSDecompressor(out).decompress(len(pixels)) != pixels):
+            return False
+    return True
+
+
+def bench_backend(backend: str, level: int, cels):
+    """
+    Compress and decompress every cel; return
+    (raw_bytes, packed_bytes, compress_seconds, decompress_seconds, ok).
+    """
+    raw = packed = 0
+    ok = True
+    elapsed = unpack = 0.0
+    for pixels in cels:
+        enc = LZSEncoder(backend, level)
+        t0 = time.perf_counter()
+        out = enc.compress(pixels)
+        t1 = time.perf_counter()
+        back = LZSDecompressor(out).decompress(len(pixels))
+        t2 = time.perf_counter()
+        elapsed += t1 - t0
+        unpack  += t2 - t1
+        raw    += len(pixels)
+        packed += len(out)
+        if back != pixels:
+            ok = False
+    ok = check_edge_cases(backend, level) and ok
+    return raw, packed, elapsed, unpack, ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark LZS compressor backends on RBT frames.')
+    ap.add_argument('rbt_files', nargs='+',
+                    help='One or more .rbt files to sample frames from')
+    ap.add_argument('--frames', type=int, default=8,
+                    help='Frames to sample per file (default: 8)')
+    ap.add_argument('--backends', default=None,
+                    help='Comma-separated backends (default: all available)')
+    ap.add_argument('--levels', default='0',
+                    help='Comma-separated LZS levels, e.g. 0,1,2 (default: 0)')
+    args = ap.parse_args()
+
+    if args.backends:
+        backends = [resolve_lzs_backend(b.strip()) for b in args.backends.split(',')]
+    else:
+        backends = available_lzs_backends()
+
+    cels = []
+    for path in args.rbt_files:
+        print(f'Sampling {args.frames} frames from {path} ...')
+        cels += sample_cels(path, args.frames)
+    if not cels:
+        sys.exit('No cels found.')
+    print(f'  {len(cels)} cels, {sum(len(c) for c in cels) / 1e6:.2f} MB raw\n')
+
+    levels = [int(lv) for lv in args.levels.split(',')]
+
+    print(f'  {"backend":<8} {"level":>5} {"packed":>10} {"ratio":>7} {"time":>8} {"MB/s":>7} '
+          f'{"unpack MB/s":>12}  round-trip')
+    failed = False
+    for level in levels:
+        for backend in backends:
+            raw, packed, secs, unpack, ok = bench_backend(backend, level, cels)
+            failed |= not ok
+            print(f'  {backend:<8} {level:>5} {packed:>10} {raw / max(1, packed):>6.2f}x '
+                  f'{secs:>7.2f}s {raw / 1e6 / max(secs, 1e-9):>7.2f} '
+                  f'{raw / 1e6 / max(unpack, 1e-9):>12.2f}  '
+                  f'{"ok" if ok else "MISMATCH"}')
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
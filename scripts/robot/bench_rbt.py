@@ -0,0 +1,250 @@
+"""
+bench_rbt.py – measure where time goes when decoding Robot files.
+
+Runs every decode stage of parse_rbt.py over one or more .rbt files and
+reports per-stage throughput:
+
+    index      RobotFile(): header, tables and frame offset index, parsed
+               from the file (the sidecar index is neither read nor written)
+    lzs        LZSDecompressor on every compressed cel chunk
+    expand     expand_cel on every vertically scaled cel
+    decode     RobotFile.read_frame (video only): the whole cel decode path
+    composite  FrameCompositor.rgb on every decoded frame
+    dpcm       deDPCM16_carry on every audio packet
+    build_pcm  decode_audio_track over the whole file (what play_rbt.build_pcm
+               runs to build its audio track)
+
+Frames are processed one at a time, so memory stays flat however long the
+video is.  Results can be written to a JSON file and compared against a
+previous run to spot regressions.
+
+Usage:
+    python bench_rbt.py [<file.rbt> ...] [options]
+
+    With no files, every .rbt under games_assets/ is benchmarked.
+
+Options:
+    --frames N         Only decode the first N frames of each file
+                       (default: all)
+    --stages LIST      Comma-separated stages to run (default: all)
+    --profile FILE     Run under cProfile, write the stats to FILE and
+                       print the top functions by cumulative time
+    --json FILE        Write the results as JSON to FILE
+    --compare FILE     Compare against the results in a previous --json FILE
+
+Example:
+    python scripts/robot/bench_rbt.py games_assets/kq7/911.RBT --json before.json
+    python scripts/robot/bench_rbt.py games_assets/kq7/911.RBT --compare before.json
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from parse_rbt import (RobotFile, LZSDecompressor, FrameCompositor,
+                       expand_cel, deDPCM16_carry, decode_audio_track)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STAGES = ['index', 'lzs', 'expand', 'decode', 'composite', 'dpcm', 'build_pcm']
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Stage timers
+# ─────────────────────────────────────────────────────────────────────────────
+
+class StageTimer:
+    """Accumulated frames, output bytes and seconds for one stage."""
+
+    def __init__(self):
+        self.frames  = 0
+        self.bytes   = 0
+        self.seconds = 0.0
+
+    def add(self, frames: int, nbytes: int, seconds: float):
+        self.frames  += frames
+        self.bytes   += nbytes
+        self.seconds += seconds
+
+    def result(self) -> dict:
+        secs = max(self.seconds, 1e-9)
+        return {
+            'frames':   self.frames,
+            'bytes':    self.bytes,
+            'seconds':  round(self.seconds, 6),
+            'frames_s': round(self.frames / secs, 2) if self.frames else 0.0,
+            'mb_s':     round(self.bytes / 1e6 / secs, 2) if self.bytes else 0.0,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Benchmark
+# ─────────────────────────────────────────────────────────────────────────────
+
+def bench_file(path: str, stages, max_frames: int = 0) -> dict:
+    """Run the selected stages over one file; return {stage: result dict}."""
+    timers = {s: StageTimer() for s in stages}
+    clock  = time.perf_counter
+
+    t0  = clock()
+    rbt = RobotFile(path, use_index=False)
+    if 'index' in timers:
+        timers['index'].add(len(rbt), os.path.getsize(path), clock() - t0)
+
+    try:
+        hdr = rbt.hdr
+        num_frames = len(rbt) if max_frames <= 0 else min(len(rbt), max_frames)
+        cw = hdr.x_res if hdr.x_res > 0 else 640
+        ch = hdr.y_res if hdr.y_res > 0 else 480
+        compositor = FrameCompositor(cw, ch, rbt.palette)
+
+        for frame_no in range(num_frames):
+            if 'lzs' in timers or 'expand' in timers:
+                packed = 0
+                t_lzs = t_exp = 0.0
+                expanded = 0
+                for cel, chunks in rbt.cel_chunks(frame_no):
+                    # Copied out of the mapped file before timing, as input
+                    chunks = [(t, d, bytes(c)) for t, d, c in chunks]
+                    pixels = bytearray()
+                    t0 = clock()
+                    for comp_type, decomp_size, chunk in chunks:
+                        if comp_type == 0:
+                            pixels += LZSDecompressor(chunk).decompress(decomp_size)
+                            packed += decomp_size
+                        else:
+                            pixels += chunk[:decomp_size]
+                    t_lzs += clock() - t0
+                    if cel.v_scale != 100 and pixels:
+                        t0 = clock()
+                        expanded += len(expand_cel(bytes(pixels), cel.width, cel.height,
+                                                   cel.v_scale))
+                        t_exp += clock() - t0
+                if 'lzs' in timers:
+                    timers['lzs'].add(1, packed, t_lzs)
+                if 'expand' in timers and expanded:
+                    timers['expand'].add(1, expanded, t_exp)
+
+            if 'decode' in timers or 'composite' in timers:
+                t0 = clock()
+                frame = rbt.read_frame(frame_no, audio=False)
+                t1 = clock()
+                if 'decode' in timers:
+                    timers['decode'].add(1, sum(len(c.pixels) for c in frame.cels), t1 - t0)
+                if 'composite' in timers:
+                    t0 = clock()
+                    compositor.rgb(frame)
+                    timers['composite'].add(1, cw * ch * 3, clock() - t0)
+
+            if 'dpcm' in timers and hdr.has_audio:
+                raw = rbt.read_frame(frame_no, video=False).audio_raw
+                if raw:
+                    t0 = clock()
+                    pcm, _ = deDPCM16_carry(raw, 0)
+                    timers['dpcm'].add(1, len(pcm), clock() - t0)
+
+        if 'build_pcm' in timers and hdr.has_audio:
+            frames = [rbt.read_frame(n, video=False) for n in range(num_frames)]
+            t0 = clock()
+            pcm = decode_audio_track(frames)
+            timers['build_pcm'].add(len(frames), len(pcm), clock() - t0)
+    finally:
+        rbt.close()
+
+    return {s: t.result() for s, t in timers.items() if t.frames}
+
+
+def print_results(path: str, results: dict, baseline: dict = None):
+    print(f'  {"stage":<10} {"frames":>7} {"MB out":>9} {"time":>9} '
+          f'{"frames/s":>10} {"MB/s":>9}' + ('   vs. baseline' if baseline else ''))
+    for stage in STAGES:
+        r = results.get(stage)
+        if not r:
+            continue
+        line = (f'  {stage:<10} {r["frames"]:>7} {r["bytes"] / 1e6:>9.2f} '
+                f'{r["seconds"]:>8.3f}s {r["frames_s"]:>10.1f} {r["mb_s"]:>9.2f}')
+        old = (baseline or {}).get(stage)
+        if old and old['frames_s'] > 0:
+            # > 1 means this run is faster than the baseline
+            line += f'   {r["frames_s"] / old["frames_s"]:>6.2f}x'
+        print(line)
+
+
+def find_rbt_files():
+    pattern = os.path.join(REPO_ROOT, 'games_assets', '**', '*')
+    return sorted(p for p in glob.glob(pattern, recursive=True)
+                  if p.lower().endswith('.rbt') and os.path.isfile(p))
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark the RBT decode stages.')
+    ap.add_argument('rbt_files', nargs='*',
+                    help='.rbt files to benchmark (default: every .rbt under games_assets/)')
+    ap.add_argument('--frames', type=int, default=0,
+                    help='Only decode the first N frames of each file (default: all)')
+    ap.add_argument('--stages', default=None,
+                    help=f'Comma-separated stages (default: {",".join(STAGES)})')
+    ap.add_argument('--profile', default=None, metavar='FILE',
+                    help='Run under cProfile and write the stats to FILE')
+    ap.add_argument('--json', default=None, metavar='FILE',
+                    help='Write the results as JSON to FILE')
+    ap.add_argument('--compare', default=None, metavar='FILE',
+                    help='Compare against a previous --json results FILE')
+    args = ap.parse_args()
+
+    stages = STAGES
+    if args.stages:
+        stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+        unknown = [s for s in stages if s not in STAGES]
+        if unknown:
+            sys.exit(f'Unknown stage(s): {", ".join(unknown)} (choose from {", ".join(STAGES)})')
+
+    paths = args.rbt_files or find_rbt_files()
+    if not paths:
+        sys.exit('No .rbt files found.')
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f).get('files', {})
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    results = {}
+    for path in paths:
+        print(f'\n{path}')
+        results[os.path.basename(path)] = bench_file(path, stages, args.frames)
+        print_results(path, results[os.path.basename(path)],
+                      baseline.get(os.path.basename(path)))
+
+    if profiler:
+        import pstats
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f'\nProfile written to {args.profile}; top functions by cumulative time:')
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+
+    if args.json:
+        report = {
+            'python':   platform.python_version(),
+            'platform': platform.platform(),
+            'time':     time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'frames':   args.frames,
+            'files':    results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nResults written to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
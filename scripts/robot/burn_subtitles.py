@@ -0,0 +1,207 @@
+"""
+burn_subtitles.py – paint subtitles straight into a Robot (.rbt) file.
+
+Does in one step, in memory, what extracting the frames with parse_rbt.py,
+painting them with inject_subtitles.py and re-encoding the folder with
+encode_rbt.py does through PNG files.  Frames are read with RobotFile;
+on frames that have subtitle text the SCI-font glyphs are painted into
+the decoded 8-bit cels, and only those frames are compressed again.  Every
+other frame packet (video and audio) is copied from the input unchanged,
+as are the header fields, palette, audio primer and cue tables.
+
+Text is laid out exactly as inject_subtitles.py lays it out on a canvas
+of the file's resolution (640×480 if the header leaves it at 0).  Glyph
+pixels that fall outside every cel are not drawn, since the player would
+not show them either.
+
+Usage:
+    python burn_subtitles.py <input.rbt> <subtitles_file> --font <font_file>
+                             --y-position Y -o <output.rbt> [options]
+
+Options:
+    --frame-offset N   Add this signed offset to every marker frame number
+    --lzs-backend B    LZS compressor for re-encoded frames (default: auto)
+    --lzs-level L      LZS parse level for re-encoded frames (default: 0)
+    -v / --verbose     Print the layout of every subtitle line drawn
+
+Re-encoded frames use LZS when the original frame did and keep each cel's
+position; cels that received text are stored at full height (v_scale 100)
+so no glyph rows are decimated away.  The output may be the input file.
+
+The subtitle file uses inject_subtitles.py's format: one `<frame>|<text>`
+marker per line, `#` separating the lines of a subtitle.
+"""
+
+import os
+import sys
+import struct
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    sys.exit("Pillow is required:  pip install Pillow")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from parse_rbt import RobotFile
+from encode_rbt import (RBTWriter, LZS_BACKENDS, LZSEncoder, MAX_SCREEN_ITEMS,
+                        encode_cel_bands, resolve_lzs_backend)
+from inject_subtitles import (build_timeline, draw_subtitle, has_subtitle_text,
+                              load_sci_font, paint_color_index_for_palette,
+                              parse_subtitle_markers)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Frame helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def frame_uses_lzs(rbt: RobotFile, frame_no: int) -> bool:
+    """True if the first chunk of the frame's first cel is LZS-compressed."""
+    fp, vlen = rbt.record_pos[frame_no], rbt.video_sizes[frame_no]
+    if vlen < 2 + 22 + 10 or struct.unpack_from('<H', rbt.data, fp)[0] == 0:
+        return False
+    num_chunks = struct.unpack_from('<H', rbt.data, fp + 2 + 16)[0]
+    return num_chunks > 0 and struct.unpack_from('<H', rbt.data, fp + 2 + 22 + 8)[0] == 0
+
+
+def paint_cels(frame, text_mask: Image.Image, color_index: int) -> bool:
+    """Paint color_index into every cel pixel under text_mask; True if any cel changed."""
+    changed = False
+    for cel in frame.cels:
+        w, h = cel.width, cel.height
+        if w <= 0 or h <= 0 or len(cel.pixels) != w * h:
+            continue
+        region = text_mask.crop((cel.x, cel.y, cel.x + w, cel.y + h))
+        if region.getbbox() is None:
+            continue
+        img = Image.frombytes('L', (w, h), bytes(cel.pixels))
+        img.paste(color_index, (0, 0, w, h), region)
+        cel.pixels = img.tobytes()
+        # Decimating the cel again would drop glyph rows: store it whole.
+        cel.v_scale = 100
+        changed = True
+    return changed
+
+
+def encode_cels(frame, use_lzs: bool, lzs_backend: str, lzs_level: int) -> bytes:
+    """Re-encode a decoded frame's cels as a video blob."""
+    packets = []
+    for cel in frame.cels:
+        packets += encode_cel_bands(cel.pixels, cel.width, cel.height, cel.x, cel.y,
+                                    use_lzs, lzs_backend, lzs_level, cel.v_scale)
+    if len(packets) > MAX_SCREEN_ITEMS:
+        raise ValueError(f"frame {frame.frame_no}: needs {len(packets)} cels after band "
+                         f"splitting; the player allows at most {MAX_SCREEN_ITEMS}")
+    return struct.pack('<H', len(packets)) + b''.join(packets)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Burn-in
+# ─────────────────────────────────────────────────────────────────────────────
+
+def burn_subtitles(rbt_path: str, subtitles_path: str, font_path: str,
+                   y_position: int, output_path: str, frame_offset: int = 0,
+                   lzs_backend: str = 'auto', lzs_level: int = 0,
+                   verbose: bool = False) -> int:
+    """
+    Write `output_path`: `rbt_path` with the subtitles of `subtitles_path`
+    painted in.  Returns the number of frames that were re-encoded.
+    """
+    markers = parse_subtitle_markers(Path(subtitles_path))
+    if frame_offset:
+        markers = sorted(((frame + frame_offset, text, line_no)
+                          for frame, text, line_no in markers), key=lambda m: m[0])
+    load_sci_font(font_path)          # fail early on a bad font file
+
+    tmp_path = output_path + '.tmp'
+    reencoded = 0
+    with RobotFile(rbt_path) as rbt:
+        if rbt.big_endian:
+            raise ValueError("Big-endian (Mac) Robot files are not supported; "
+                             "RBTWriter writes little-endian files only.")
+        hdr = rbt.hdr
+        cw = hdr.x_res if hdr.x_res > 0 else 640
+        ch = hdr.y_res if hdr.y_res > 0 else 480
+        texts = dict(build_timeline(markers, 0, len(rbt) - 1))
+
+        flat_palette = [v for c in rbt.palette for v in c] if rbt.palette else None
+        paint_color_index = paint_color_index_for_palette(flat_palette, 0)
+        lzs_backend = resolve_lzs_backend(lzs_backend)
+
+        try:
+            writer = RBTWriter(
+                tmp_path, len(rbt), rbt.raw_palette,
+                fps=hdr.frame_rate, audio_block_size=hdr.audio_block_size,
+                has_audio=hdr.has_audio, force_v6=hdr.version == 6,
+                is_hi_res=hdr.is_hi_res, x_res=hdr.x_res, y_res=hdr.y_res,
+                primer=rbt.raw_primer, primer_zero_compress=hdr.primer_zero_compress,
+                max_skippable=hdr.max_skippable,
+                cue_times=rbt.cue_times, cue_values=rbt.cue_values)
+            with writer:
+                for frame_no in range(len(rbt)):
+                    fp    = rbt.record_pos[frame_no]
+                    vlen  = rbt.video_sizes[frame_no]
+                    video = rbt.data[fp: fp + vlen]
+                    audio = rbt.data[fp + vlen: fp + rbt.packet_sizes[frame_no]]
+
+                    text = texts.get(frame_no, '')
+                    if has_subtitle_text(text):
+                        text_mask = Image.new('1', (cw, ch), 0)
+                        log = draw_subtitle(text_mask, frame_no, text, font_path, y_position, 1)
+                        if verbose:
+                            for line in log:
+                                print(line)
+                        frame = rbt.read_frame(frame_no, audio=False)
+                        if paint_cels(frame, text_mask, paint_color_index):
+                            video = encode_cels(frame, frame_uses_lzs(rbt, frame_no),
+                                                lzs_backend, lzs_level)
+                            reencoded += 1
+
+                    writer.write_frame(video, audio)
+        except BaseException:
+            # Never leave a partial output behind, whether the error came
+            # from painting a frame or from RBTWriter.close() itself.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    os.replace(tmp_path, output_path)
+    return reencoded
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Paint subtitles straight into a Robot (.rbt) file.')
+    ap.add_argument('rbt_file',
+                    help='Input .rbt file')
+    ap.add_argument('subtitles',
+                    help='Subtitle marker file (<frame>|<text> per line)')
+    ap.add_argument('--font', required=True,
+                    help='SCI font file')
+    ap.add_argument('--y-position', type=int, required=True,
+                    help='Top of the first subtitle line, in canvas pixels')
+    ap.add_argument('-o', '--output', required=True,
+                    help='Output .rbt file (may be the input file)')
+    ap.add_argument('--frame-offset', type=int, default=0,
+                    help='Add this signed offset to each marker frame number')
+    ap.add_argument('--lzs-backend', default='auto',
+                    choices=('auto',) + LZS_BACKENDS,
+                    help='LZS compressor for re-encoded frames (default: fastest available)')
+    ap.add_argument('--lzs-level', type=int, default=0, choices=LZSEncoder.LEVELS,
+                    help='LZS parse for re-encoded frames: 0=greedy (default), 1=lazy, 2=optimal')
+    ap.add_argument('-v', '--verbose', action='store_true',
+                    help='Print the layout of every subtitle line drawn')
+    args = ap.parse_args()
+
+    if not os.path.isfile(args.font):
+        sys.exit(f'Font file not found: {args.font}')
+
+    reencoded = burn_subtitles(args.rbt_file, args.subtitles, args.font,
+                               args.y_position, args.output, args.frame_offset,
+                               args.lzs_backend, args.lzs_level, args.verbose)
+    print(f'{args.output}: {reencoded} frames re-encoded with subtitles')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,8 +17,27 @@ Options:
     --canvas-height H Override output canvas height.
     --lzs             Use LZS compression for video chunks (smaller files,
                       required if frame size > ~64KB for v5).
+    --lzs-backend B   LZS compressor: auto (default), python, numpy, or native
+                      (an installed `lzs_native` extension module).
+    --lzs-level L     LZS parse: 0 = greedy (default), 1 = lazy matching,
+                      2 = bit-cost optimal parse (smallest packets, slowest).
+    --delta PLATE     Delta cels: store only the rectangles of each frame that
+                      differ from PLATE, the static background the game draws
+                      behind the robot (cels do not persist between frames,
+                      so the reference is the plate, not the previous frame).
+    --max-cels N      Cels per frame in --delta mode (default: 4, max 10).
+    --v-scale PCT     Vertical scale: store only PCT% of each cel's rows
+                      (default: 100). The decoder replicates rows back to full
+                      height, as in Sierra's own hi-res cutscenes.
+    --incremental     Keep a cache of encoded frames in <output>.cache and only
+                      compress frames whose indexed pixels changed since the
+                      previous run. The output is byte-identical to a full
+                      encode; unused cache entries are pruned.
+    --cache-dir DIR   Cache directory for --incremental (implies it).
     --v6              Force Robot v6 format (uint32 indices; needed for large
                       frames like 640×480 uncompressed).
+    --jobs N          Encode frames in N worker processes (default: 1;
+                      0 = one per CPU). Output is identical to a serial run.
 
 Output:
     A .rbt file playable in ScummVM (SCI2/SCI2.1 games supporting Robot videos).
@@ -35,7 +54,8 @@ Notes:
 
 Dependencies:
     pip install Pillow        (required for image loading/quantization)
-    pip install numpy         (optional, for faster audio resampling)
+    pip install numpy         (optional, for faster audio resampling, palette
+                              mapping and LZS)
 """
 
 import struct
@@ -44,8 +64,10 @@ import sys
 import glob
 import wave
 import argparse
-import bisect
 import time
+import multiprocessing
+import hashlib
+import functools
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -94,6 +116,180 @@ class ProgressBar:
 # LZS (STACpack) Encoder  — hash-chain O(n) average, O(n·k) worst case
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Optional compiled backend: any importable module named `lzs_native` that
+# exposes compress(data: bytes) -> bytes producing a ScummVM-compatible LZS
+# stream.  None is shipped with these tools; the pure-Python and NumPy
+# backends are always available (the latter only if numpy is installed).
+try:
+    import lzs_native as _lzs_native
+except ImportError:
+    _lzs_native = None
+
+LZS_BACKENDS = ('python', 'numpy', 'native')
+
+
+def available_lzs_backends():
+    """Return the LZS backends usable in this environment, fastest last."""
+    backends = ['python']
+    try:
+        import numpy  # noqa: F401
+        backends.append('numpy')
+    except ImportError:
+        pass
+    if _lzs_native is not None:
+        backends.append('native')
+    return backends
+
+
+def resolve_lzs_backend(name: str = 'auto') -> str:
+    """Map 'auto' to the fastest available backend and validate explicit names."""
+    available = available_lzs_backends()
+    if name == 'auto':
+        return available[-1]
+    if name not in LZS_BACKENDS:
+        raise ValueError(f"Unknown LZS backend '{name}' "
+                         f"(choose from auto, {', '.join(LZS_BACKENDS)})")
+    if name not in available:
+        raise ValueError(f"LZS backend '{name}' is not available here "
+                         f"(available: {', '.join(available)})")
+    return name
+
+
+def _lzs_chain_python(src: bytes):
+    """
+    Hash chain over 3-byte keys: prev[p] = previous position with the same
+    3 bytes as position p, or -1.  The last two positions have no key.
+
+    Also returns byte runs: run_len[p] = number of equal bytes starting at
+    p (a back-reference at offset 1 matches exactly that many) and
+    run_start[p] = first position of the run containing p.
+    """
+    n    = len(src)
+    prev = [-1] * n
+    head = {}
+    for p in range(n - 2):
+        key = src[p:p + 3]
+        prev[p] = head.get(key, -1)
+        head[key] = p
+
+    run_len   = [1] * n
+    run_start = [0] * n
+    for p in range(n - 2, -1, -1):
+        if src[p] == src[p + 1]:
+            run_len[p] = run_len[p + 1] + 1
+    for p in range(1, n):
+        run_start[p] = run_start[p - 1] if src[p] == src[p - 1] else p
+    return prev, run_len, run_start
+
+
+def _lzs_chain_numpy(src: bytes):
+    """
+    Same chain and runs as _lzs_chain_python, built with one stable
+    argsort over precomputed 24-bit keys and run-boundary detection.
+    """
+    import numpy as np
+
+    n = len(src)
+    if n == 0:
+        return [], [], []
+    a = np.frombuffer(src, dtype=np.uint8).astype(np.int32)
+
+    prev = np.full(n, -1, dtype=np.int64)
+    if n >= 3:
+        keys  = (a[:-2] << 16) | (a[1:-1] << 8) | a[2:]
+        order = np.argsort(keys, kind='stable')   # ascending positions per key
+        same  = keys[order[1:]] == keys[order[:-1]]
+        prev[order[1:][same]] = order[:-1][same]
+
+    change   = np.empty(n, dtype=bool)
+    change[0] = True
+    change[1:] = a[1:] != a[:-1]
+    starts   = np.flatnonzero(change)
+    ends     = np.append(starts[1:], n)
+    run_id   = np.cumsum(change) - 1
+    run_len  = ends[run_id] - np.arange(n)
+
+    return prev.tolist(), run_len.tolist(), starts[run_id].tolist()
+
+
+def _match_len(src: bytes, cand: int, pos: int, start: int, limit: int) -> int:
+    """
+    Length of the common prefix of src[cand:] and src[pos:], capped at
+    `limit`, given that the first `start` bytes are already known to match.
+    Compares slices (memcmp) in a binary search instead of byte by byte.
+    """
+    if src[cand:cand + limit] == src[pos:pos + limit]:
+        return limit
+    lo, hi = start, limit
+    while hi - lo > 1:
+        mid = (lo + hi) >> 1
+        if src[cand + lo:cand + mid] == src[pos + lo:pos + mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _pack_lzs_tokens_numpy(tokens) -> bytes:
+    """
+    Vectorised bit packer: turn (offset, length) / (0, literal) tokens into
+    the MSB-first LZS bitstream, including the end-of-stream marker.
+    Produces exactly the bytes LZSEncoder's _put()-based writer would.
+    """
+    import numpy as np
+
+    # End-of-stream marker is a 7-bit back-reference with offset 0 and no
+    # length field: encode it as a near match with length 0.
+    t    = np.array(tokens + [(0, -1)], dtype=np.int64).reshape(-1, 2)
+    offs = t[:, 0]
+    val  = t[:, 1]
+    lit  = offs == 0
+    lit[-1] = False
+    near = ~lit & (offs <= 127)
+    far  = ~lit & ~near
+    mlen = np.where(lit, 0, val)
+    mlen[-1] = 0
+
+    # Field 1: literal flag + byte, or match flag + offset type + offset.
+    v1 = np.where(lit, val, np.where(near, (0b11 << 7) | offs, (0b10 << 11) | offs))
+    n1 = np.where(lit, 9, np.where(near, 9, 13))
+
+    # Field 2: length class (2-4 → 2 bits, 5-7 → 4 bits, 8+ → 4 bits 1111).
+    short = (mlen >= 2) & (mlen <= 4)
+    mid   = (mlen >= 5) & (mlen <= 7)
+    long_ = mlen >= 8
+    v2 = np.where(short, mlen - 2, np.where(mid, 0b1100 | (mlen - 5), 0b1111))
+    n2 = np.where(short, 2, np.where(mid | long_, 4, 0))
+    v2 = np.where(n2 > 0, v2, 0)
+
+    # Field 3: run of 0xF nibbles (all one bits); field 4: final nibble.
+    rest = np.where(long_, mlen - 8, 0)
+    n3 = np.where(long_, (rest // 15) * 4, 0)
+    v4 = np.where(long_, rest % 15, 0)
+    n4 = np.where(long_, 4, 0)
+
+    tok_bits = n1 + n2 + n3 + n4
+    start1   = np.cumsum(tok_bits) - tok_bits
+    start2   = start1 + n1
+    start3   = start2 + n2
+    start4   = start3 + n3
+    total    = int(tok_bits.sum())
+
+    bits = np.zeros(total, dtype=np.uint8)
+    for start, v, nb in ((start1, v1, n1), (start2, v2, n2), (start4, v4, n4)):
+        for j in range(int(nb.max(initial=0))):
+            sel = nb > j
+            bits[start[sel] + j] = (v[sel] >> (nb[sel] - 1 - j)) & 1
+    if n3.any():
+        sel    = n3 > 0
+        counts = n3[sel]
+        base   = np.repeat(start3[sel], counts)
+        within = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        bits[base + within] = 1
+
+    return np.packbits(bits).tobytes()
+
+
 class LZSEncoder:
     """
     MSB-first bitstream LZS / STACpack compressor matching ScummVM's
@@ -102,13 +298,33 @@ class LZSEncoder:
     Uses a hash-chain (3-byte key → most-recent position) for O(n) average
     performance instead of the O(n²) brute-force search, making it practical
     for large frames (640×480 = 307 200 bytes).
+
+    Backends (see available_lzs_backends()):
+      python – dict-built hash chain, bit-by-bit writer (reference)
+      numpy  – argsort-built hash chain, run-length shortcut for offset-1
+               matches and a vectorised bit packer; byte-identical output
+      native – the optional compiled `lzs_native` module, if importable
+
+    Levels (python / numpy backends):
+      0 – greedy: longest match at each position (fastest)
+      1 – lazy: defer a match by one byte when a longer one starts there
+      2 – optimal: minimum-bit-cost parse by dynamic programming (slowest,
+          smallest output)
     """
 
     WINDOW   = 2047   # maximum back-reference distance
     MAX_MATCH = 255   # cap search depth for speed
     MIN_MATCH = 2
-
-    def __init__(self):
+    LEVELS    = (0, 1, 2)   # greedy, lazy, optimal parse
+    # hash-chain candidates examined per position, per level
+    MAX_CHAIN = {0: 32, 1: 32, 2: 64}
+
+    def __init__(self, backend: str = 'auto', level: int = 0):
+        if level not in self.LEVELS:
+            raise ValueError(f"LZS level must be one of {self.LEVELS}, got {level}")
+        self.backend   = resolve_lzs_backend(backend)
+        self.level     = level
+        self.max_chain = self.MAX_CHAIN[level]
         self._buf   = 0
         self._nbits = 0
         self._out   = bytearray()
@@ -142,97 +358,24 @@ class LZSEncoder:
             remaining -= 0xF
         self._put(remaining, 4)
 
-    # ── Compression ───────────────────────────────────────────────────────────
-
-    def compress(self, data: bytes) -> bytes:
-        """
-        Compress `data` and return LZS-compressed bytes.
-
-        Strategy: maintain a dict mapping each 3-byte key to the chain of
-        recent positions where that key was seen (within WINDOW bytes).
-        For each position we check the chain head (most recent occurrence)
-        and extend the match greedily.
-        """
+    def _write_tokens(self, tokens) -> bytes:
+        """Serialise (offset, length) / (0, literal) tokens plus end marker."""
         self._buf   = 0
         self._nbits = 0
         self._out   = bytearray()
-
-        src = data
-        n   = len(src)
-        pos = 0
-
-        # hash_head[key] = most recent position of that 3-byte sequence
-        # hash_prev[pos] = previous position in chain for the same key
-        hash_head = {}
-        hash_prev = {}
-
-        def _find_match(pos):
-            """Return (best_offset, best_length) or (0, 0) if no useful match."""
-            if pos + self.MIN_MATCH > n:
-                return 0, 0
-            # Build 3-byte key (or 2-byte if near end)
-            key = src[pos:pos + 3] if pos + 3 <= n else src[pos:pos + 2]
-            best_offs = 0
-            best_len  = 0
-
-            candidate = hash_head.get(key, -1)
-            # Walk the chain (limit iterations to keep it fast)
-            steps = 0
-            while candidate >= 0 and steps < 32:
-                offs = pos - candidate
-                if offs > self.WINDOW:
-                    break
-                # Measure match length
-                mlen = 0
-                limit = min(n - pos, self.MAX_MATCH)
-                while mlen < limit and src[candidate + mlen] == src[pos + mlen]:
-                    mlen += 1
-                if mlen > best_len:
-                    best_len  = mlen
-                    best_offs = offs
-                    if mlen >= self.MAX_MATCH:
-                        break
-                candidate = hash_prev.get(candidate, -1)
-                steps += 1
-
-            return (best_offs, best_len) if best_len >= self.MIN_MATCH else (0, 0)
-
-        def _add_to_hash(p):
-            """Insert position p into the hash chain."""
-            key = src[p:p + 3] if p + 3 <= n else src[p:p + 2]
-            prev = hash_head.get(key, -1)
-            # Expire entries that have left the window
-            if prev >= 0 and pos - prev > self.WINDOW:
-                prev = -1
-            hash_prev[p] = prev
-            hash_head[key] = p
-
-        while pos < n:
-            # Search BEFORE adding current position to hash.
-            # Adding pos first would make _find_match find the current position
-            # as a candidate with offset=0, which is the LZS end-of-stream
-            # marker — causing the decompressor to stop immediately.
-            best_offs, best_len = _find_match(pos)
-
-            if best_len >= self.MIN_MATCH:
+        for offs, val in tokens:
+            if offs:
                 self._put(1, 1)
-                if best_offs <= 127:
+                if offs <= 127:
                     self._put(1, 1)
-                    self._put(best_offs, 7)
+                    self._put(offs, 7)
                 else:
                     self._put(0, 1)
-                    self._put(best_offs, 11)
-                self._put_comp_len(best_len)
-                # Add all positions covered by this match to the hash
-                for k in range(best_len):
-                    if pos + k < n:
-                        _add_to_hash(pos + k)
-                pos += best_len
+                    self._put(offs, 11)
+                self._put_comp_len(val)
             else:
-                _add_to_hash(pos)
                 self._put(0, 1)
-                self._put(src[pos], 8)
-                pos += 1
+                self._put(val, 8)
 
         # End-of-stream marker
         self._put(1, 1)
@@ -241,6 +384,224 @@ class LZSEncoder:
         self._flush(force=True)
         return bytes(self._out)
 
+    # ── Match finding ─────────────────────────────────────────────────────────
+
+    def _find_match(self, src: bytes, pos: int, prev, run_len):
+        """Return (best_offset, best_length) or (0, 0) if no useful match."""
+        n     = len(src)
+        limit = min(n - pos, self.MAX_MATCH)
+        if limit < self.MIN_MATCH:
+            return 0, 0
+
+        best_offs = 0
+        best_len  = 0
+        candidate = prev[pos]
+        steps     = 0
+        # Walk the chain (limit iterations to keep it fast)
+        while candidate >= 0 and steps < self.max_chain:
+            offs = pos - candidate
+            if offs > self.WINDOW:
+                break
+            if offs == 1:
+                mlen = min(run_len[pos], limit)
+            elif best_len and src[candidate + best_len] != src[pos + best_len]:
+                mlen = 0                       # cannot beat the current best
+            else:
+                # Chain entries share the 3-byte key, so 3 bytes already match
+                mlen = _match_len(src, candidate, pos, 3, limit)
+            if mlen > best_len:
+                best_len  = mlen
+                best_offs = offs
+                if mlen >= limit:
+                    break
+            candidate = prev[candidate]
+            steps += 1
+
+        return (best_offs, best_len) if best_len >= self.MIN_MATCH else (0, 0)
+
+    def _find_matches(self, src: bytes, pos: int, prev, run_len, run_start):
+        """
+        Return (near_offs, near_len, far_offs, far_len): the longest match
+        with a 7-bit offset and the longest (strictly longer) match with an
+        11-bit offset.  Lengths are 0 when there is no such match.
+
+        Every candidate inside the byte run that contains `pos` matches
+        exactly run_len[pos] bytes, so after the offset-1 candidate the
+        walk jumps straight to the chain entry before that run.
+        """
+        n     = len(src)
+        limit = min(n - pos, self.MAX_MATCH)
+        near_offs = near_len = far_offs = far_len = 0
+        if limit < self.MIN_MATCH:
+            return 0, 0, 0, 0
+
+        candidate = prev[pos]
+        steps     = 0
+        best      = 0
+        while candidate >= 0 and steps < self.max_chain:
+            offs = pos - candidate
+            if offs > self.WINDOW:
+                break
+            if offs == 1:
+                mlen = min(run_len[pos], limit)
+            elif best and src[candidate + best] != src[pos + best]:
+                mlen = 0
+            else:
+                mlen = _match_len(src, candidate, pos, 3, limit)
+            if mlen > best:
+                best = mlen
+                if offs <= 127:
+                    near_offs, near_len = offs, mlen
+                else:
+                    far_offs, far_len = offs, mlen
+                if mlen >= limit:
+                    break
+            if offs == 1:
+                candidate = prev[run_start[pos]]
+            else:
+                candidate = prev[candidate]
+            steps += 1
+
+        if near_len < self.MIN_MATCH:
+            near_offs = near_len = 0
+        if far_len < self.MIN_MATCH:
+            far_offs = far_len = 0
+        return near_offs, near_len, far_offs, far_len
+
+    def _parse_greedy(self, src: bytes, prev, run_len, run_start):
+        """Level 0: take the longest match at every position (or a literal)."""
+        tokens = []
+        n   = len(src)
+        pos = 0
+        while pos < n:
+            best_offs, best_len = self._find_match(src, pos, prev, run_len)
+            if best_len:
+                tokens.append((best_offs, best_len))
+                pos += best_len
+            else:
+                tokens.append((0, src[pos]))
+                pos += 1
+        return tokens
+
+    def _parse_lazy(self, src: bytes, prev, run_len, run_start):
+        """
+        Level 1: like greedy, but before committing to a match look one byte
+        ahead; if a longer match starts there, emit a literal instead.
+        """
+        tokens = []
+        n   = len(src)
+        pos = 0
+        match = self._find_match(src, 0, prev, run_len)
+        while pos < n:
+            best_offs, best_len = match
+            if best_len:
+                nxt = self._find_match(src, pos + 1, prev, run_len)
+                if nxt[1] > best_len:
+                    tokens.append((0, src[pos]))
+                    pos  += 1
+                    match = nxt
+                    continue
+                tokens.append((best_offs, best_len))
+                pos += best_len
+            else:
+                tokens.append((0, src[pos]))
+                pos += 1
+            match = self._find_match(src, pos, prev, run_len)
+        return tokens
+
+    def _parse_optimal(self, src: bytes, prev, run_len, run_start):
+        """
+        Level 2: dynamic-programming parse minimising the total bit cost.
+
+        cost[p] = fewest bits needed to encode src[p:].  It never increases
+        with p, so within one length class (2-4, 5-7, 8-22, 23-37, …, all
+        sharing one length-field size) the longest usable length is always
+        the cheapest; only one length per class and offset type is tried.
+        """
+        n    = len(src)
+        cost = [0] * (n + 1)
+        pick = [None] * n
+        classes = _LZS_LENGTH_CLASSES
+        for pos in range(n - 1, -1, -1):
+            best   = 9 + cost[pos + 1]                  # literal: flag + byte
+            choice = None
+            near_offs, near_len, far_offs, far_len = self._find_matches(
+                src, pos, prev, run_len, run_start)
+            for lo, hi, len_bits in classes:
+                if lo > near_len:
+                    break
+                mlen = near_len if near_len < hi else hi
+                c = 9 + len_bits + cost[pos + mlen]     # flag + 7-bit offset
+                if c < best:
+                    best, choice = c, (near_offs, mlen)
+            for lo, hi, len_bits in classes:
+                if lo > far_len:
+                    break
+                if hi <= near_len:
+                    continue                            # near is cheaper here
+                mlen = far_len if far_len < hi else hi
+                c = 13 + len_bits + cost[pos + mlen]    # flag + 11-bit offset
+                if c < best:
+                    best, choice = c, (far_offs, mlen)
+            cost[pos] = best
+            pick[pos] = choice
+
+        tokens = []
+        pos = 0
+        while pos < n:
+            choice = pick[pos]
+            if choice:
+                tokens.append(choice)
+                pos += choice[1]
+            else:
+                tokens.append((0, src[pos]))
+                pos += 1
+        return tokens
+
+    # ── Compression ───────────────────────────────────────────────────────────
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress `data` and return LZS-compressed bytes.
+
+        Strategy: build a chain linking each position to the previous
+        position with the same 3-byte key.  For each position we walk the
+        chain from the most recent occurrence (within WINDOW bytes) and keep
+        the longest match; `level` picks how matches become tokens (greedy,
+        lazy or optimal parse).  The match search never sees the current
+        position, so it can never emit offset 0 — the LZS end-of-stream
+        marker, which would stop the decompressor immediately.
+        """
+        src = bytes(data)
+        if self.backend == 'native':
+            return _lzs_native.compress(src)
+
+        if self.backend == 'numpy':
+            prev, run_len, run_start = _lzs_chain_numpy(src)
+        else:
+            prev, run_len, run_start = _lzs_chain_python(src)
+
+        parse  = (self._parse_greedy, self._parse_lazy, self._parse_optimal)[self.level]
+        tokens = parse(src, prev, run_len, run_start)
+
+        if self.backend == 'numpy':
+            return _pack_lzs_tokens_numpy(tokens)
+        return self._write_tokens(tokens)
+
+
+def _lzs_length_classes(max_len: int):
+    """(first, last, field_bits) for each run of lengths sharing a field size."""
+    classes = [(2, 4, 2), (5, 7, 4)]
+    lo, bits = 8, 8
+    while lo <= max_len:
+        classes.append((lo, min(lo + 14, max_len), bits))
+        lo   += 15
+        bits += 4
+    return classes
+
+
+_LZS_LENGTH_CLASSES = _lzs_length_classes(LZSEncoder.MAX_MATCH)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Sierra SOL DPCM-16 Encoder
@@ -266,6 +627,21 @@ _DPCM16_TABLE = [
 ]
 
 
+def _dpcm16_index_table() -> bytes:
+    """
+    Table index for every step size 0..65535: the largest entry of
+    _DPCM16_TABLE not above it (what bisect_right(...) - 1 returns).
+    """
+    out = bytearray()
+    for idx in range(127):
+        out += bytes([idx]) * (_DPCM16_TABLE[idx + 1] - _DPCM16_TABLE[idx])
+    out += bytes([127]) * (65536 - len(out))
+    return bytes(out)
+
+
+_DPCM16_INDEX = _dpcm16_index_table()
+
+
 def encode_dpcm16_block(samples_int16, carry_in: int = 0):
     """
     Encode a sequence of int16 samples as Sierra SOL DPCM-16.
@@ -274,19 +650,19 @@ def encode_dpcm16_block(samples_int16, carry_in: int = 0):
     """
     out    = bytearray()
     sample = carry_in
+    table  = _DPCM16_TABLE
+    index  = _DPCM16_INDEX      # |delta| -> greedy table index, no bisect
 
     for s in samples_int16:
         delta = s - sample
         if delta >= 0:
-            idx = bisect.bisect_right(_DPCM16_TABLE, delta) - 1
-            idx = max(0, min(127, idx))
+            idx = index[delta]
             out.append(idx)
-            sample += _DPCM16_TABLE[idx]
+            sample += table[idx]
         else:
-            idx = bisect.bisect_right(_DPCM16_TABLE, -delta) - 1
-            idx = max(0, min(127, idx))
+            idx = index[-delta]
             out.append(0x80 | idx)
-            sample -= _DPCM16_TABLE[idx]
+            sample -= table[idx]
 
         # emulate x86 16-bit overflow
         if sample > 32767:
@@ -411,13 +787,84 @@ def get_palette_from_image(img):
     return _raw_to_colors(_getpalette(quantized))
 
 
+def _palette_image(palette_colors):
+    """Return a 1×1 'P' image carrying `palette_colors`, for Image.quantize()."""
+    from PIL import Image
+
+    # Flatten palette to a 768-byte list
+    flat = []
+    for r, g, b in palette_colors:
+        flat += [r, g, b]
+    flat = (flat + [0] * 768)[:768]
+
+    pal_img = Image.new('P', (1, 1))
+    pal_img.putpalette(flat)
+    return pal_img
+
+
+class PaletteMapper:
+    """
+    Maps RGB images onto a fixed 256-colour palette, exactly like
+    Image.quantize(palette=..., dither=0) but with one table lookup.
+
+    Pillow's nearest-colour search answers from a cache indexed by the top
+    6 bits of each channel, so every colour in a 4×4×4 cell gets the same
+    index.  Quantizing one colour per cell once (64³ = 262144 colours)
+    therefore yields a lookup table that reproduces Pillow bit for bit;
+    frames are then mapped with a NumPy gather.  Without NumPy the mapper
+    falls back to Image.quantize().
+    """
+
+    def __init__(self, palette_colors):
+        from PIL import Image
+
+        self.pal_img = _palette_image(palette_colors)
+        try:
+            import numpy as np
+        except ImportError:
+            self.lut = None
+            return
+
+        cells = np.arange(64 * 64 * 64, dtype=np.uint32)
+        rgb   = np.empty((cells.size, 3), dtype=np.uint8)
+        rgb[:, 0] = (cells >> 12) << 2
+        rgb[:, 1] = ((cells >> 6) & 63) << 2
+        rgb[:, 2] = (cells & 63) << 2
+        cube = Image.frombuffer('RGB', (512, 512), rgb.tobytes(), 'raw', 'RGB', 0, 1)
+        self.lut = np.frombuffer(cube.quantize(palette=self.pal_img, dither=0).tobytes(),
+                                 dtype=np.uint8)
+
+    def map_image(self, img) -> bytes:
+        """Return the palette indices of `img` (any mode) as bytes."""
+        img_rgb = img if img.mode == 'RGB' else img.convert('RGB')   # RGBA, L, etc.
+        if self.lut is None:
+            return bytes(img_rgb.quantize(palette=self.pal_img, dither=0).tobytes())
+
+        import numpy as np
+        rgb  = np.asarray(img_rgb).reshape(-1, 3) >> 2
+        cell = rgb[:, 0].astype(np.uint32)
+        cell <<= 6
+        cell |= rgb[:, 1]
+        cell <<= 6
+        cell |= rgb[:, 2]
+        return self.lut.take(cell).tobytes()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_palette_mapper(palette_key) -> PaletteMapper:
+    return PaletteMapper(palette_key)
+
+
+def palette_mapper(palette_colors) -> PaletteMapper:
+    """Return the (per-process cached) PaletteMapper for `palette_colors`."""
+    return _cached_palette_mapper(tuple(tuple(c) for c in palette_colors))
+
+
 def image_to_indexed(img, palette_colors):
     """
     Convert a Pillow Image to an 8-bit indexed bytes object matching palette_colors.
     Handles P, RGB, RGBA, and any other mode.
     """
-    from PIL import Image
-
     w, h = img.size
 
     if img.mode == 'P':
@@ -427,21 +874,7 @@ def image_to_indexed(img, palette_colors):
             return raw
         # Unexpected size; fall through to re-quantize
 
-    # Flatten palette to a 768-byte list
-    flat = []
-    for r, g, b in palette_colors:
-        flat += [r, g, b]
-    flat = (flat + [0] * 768)[:768]
-
-    # Convert to plain RGB (handles RGBA, L, etc.)
-    img_rgb = img.convert('RGB')
-
-    # Build a 1×1 palette reference image
-    pal_img = Image.new('P', (1, 1))
-    pal_img.putpalette(flat)
-
-    result = img_rgb.quantize(palette=pal_img, dither=0)
-    return bytes(result.tobytes())
+    return palette_mapper(palette_colors).map_image(img)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -583,32 +1016,49 @@ def build_audio_blocks(samples_11k, num_frames: int, fps: int):
 # Video frame encoder
 # ─────────────────────────────────────────────────────────────────────────────
 
-def encode_cel_uncompressed(pixels: bytes, width: int, height: int,
-                             x: int = 0, y: int = 0):
+def expand_row_counts(cel_height: int, v_scale: int):
     """
-    Build a Robot v5/v6 cel packet (header + single uncompressed data chunk).
-    NOTE: the cel header's data_size field is always uint16 — call
-    encode_cel_lzs() instead when len(pixels) > ~65515.
+    Return how many output rows each stored row expands to for a cel of
+    `cel_height` rows stored at `v_scale` percent — the same Bresenham
+    distribution as RobotDecoder::expandCel (parse_rbt.expand_cel).
     """
-    chunk_data   = pixels
-    comp_size    = len(chunk_data)
-    decomp_size  = comp_size
-    comp_type    = 2                   # uncompressed
+    source_height = (cel_height * v_scale) // 100
+    counts    = []
+    remainder = 0
+    for _ in range(source_height):
+        remainder += cel_height
+        counts.append(remainder // source_height)
+        remainder %= source_height
+    return counts
 
-    chunk_header = (struct.pack('<I', comp_size) +
-                    struct.pack('<I', decomp_size) +
-                    struct.pack('<H', comp_type))
-    chunk        = chunk_header + chunk_data
-
-    data_size    = len(chunk)          # 10 + pixel_count
-    if data_size > 65535:
-        raise ValueError(
-            f"Uncompressed cel data_size {data_size} exceeds uint16 limit. "
-            "Use --lzs flag or reduce the canvas size.")
-
-    num_chunks   = 1
-    v_scale      = 100
 
+def decimate_cel(pixels: bytes, width: int, height: int, v_scale: int) -> bytes:
+    """
+    Drop rows the way Sierra's encoder did for v_scale < 100: keep one row
+    per group of output rows that the decoder will replicate from it (the
+    middle row of each group), so expand_cel() restores full height.
+    """
+    if v_scale >= 100:
+        return pixels
+    rows = []
+    first = 0
+    for count in expand_row_counts(height, v_scale):
+        y = first + count // 2
+        rows.append(pixels[y * width:(y + 1) * width])
+        first += count
+    return b''.join(rows)
+
+
+def _effective_v_scale(height: int, v_scale: int) -> int:
+    """Cels too short to lose a row at this scale are stored at 100%."""
+    if v_scale >= 100 or (height * v_scale) // 100 < 1:
+        return 100
+    return v_scale
+
+
+def _cel_header(width: int, height: int, x: int, y: int,
+                data_size: int, num_chunks: int, v_scale: int) -> bytes:
+    """Build the 22-byte Robot cel header (kCelHeaderSize)."""
     cel_header = bytearray(22)
     cel_header[1]  = v_scale
     struct.pack_into('<H', cel_header, 2,  width)
@@ -617,62 +1067,622 @@ def encode_cel_uncompressed(pixels: bytes, width: int, height: int,
     struct.pack_into('<H', cel_header, 12, y & 0xFFFF)
     struct.pack_into('<H', cel_header, 14, data_size)
     struct.pack_into('<H', cel_header, 16, num_chunks)
+    return bytes(cel_header)
 
-    return bytes(cel_header) + chunk
 
+MAX_SCREEN_ITEMS  = 10       # kScreenItemListSize: hard cap on cels per frame
+MAX_CEL_DATA_SIZE = 0xFFFF   # cel header data_size is uint16 in v5 and v6
+BAND_CHUNK_BYTES  = 0x4000   # raw bytes per chunk when a cel is split into bands
 
-def encode_cel_lzs(pixels: bytes, width: int, height: int,
-                   x: int = 0, y: int = 0):
+
+def _encode_chunk(data: bytes, use_lzs: bool, lzs_backend: str = 'auto',
+                  lzs_level: int = 0) -> bytes:
+    """Build one cel data chunk (10-byte chunk header + payload)."""
+    if use_lzs:
+        payload   = LZSEncoder(lzs_backend, lzs_level).compress(data)
+        comp_type = 0                   # LZS
+    else:
+        payload   = data
+        comp_type = 2                   # uncompressed
+
+    chunk_header = (struct.pack('<I', len(payload)) +
+                    struct.pack('<I', len(data)) +
+                    struct.pack('<H', comp_type))
+    return chunk_header + payload
+
+
+def _encode_cel_chunks(pixels: bytes, width: int, height: int, v_scale: int,
+                       use_lzs: bool, lzs_backend: str = 'auto',
+                       lzs_level: int = 0, chunk_bytes: int = 0):
     """
-    Build a Robot v5 cel packet using LZS compression.
+    Decimate a cel and encode its stored rows as data chunks, each holding
+    whole rows and at most `chunk_bytes` raw bytes (0 = a single chunk).
+    Returns (effective v_scale, [chunk, ...]).
     """
-    enc          = LZSEncoder()
-    compressed   = enc.compress(pixels)
+    v_scale = _effective_v_scale(height, v_scale)
+    stored  = decimate_cel(pixels, width, height, v_scale)
+    step    = max(1, chunk_bytes // width) * width if chunk_bytes else len(stored)
+    chunks  = [_encode_chunk(stored[i:i + step], use_lzs, lzs_backend, lzs_level)
+               for i in range(0, len(stored), max(1, step))]
+    return v_scale, chunks
 
-    comp_size    = len(compressed)
-    decomp_size  = len(pixels)          # = width * height
-    comp_type    = 0                    # LZS
 
-    chunk_header = (struct.pack('<I', comp_size) +
-                    struct.pack('<I', decomp_size) +
-                    struct.pack('<H', comp_type))
-    chunk        = chunk_header + compressed
+def encode_cel_uncompressed(pixels: bytes, width: int, height: int,
+                             x: int = 0, y: int = 0, v_scale: int = 100):
+    """
+    Build a Robot v5/v6 cel packet (header + single uncompressed data chunk).
+    NOTE: the cel header's data_size field is always uint16 — use
+    encode_cel_bands() when len(pixels) > ~65515.
+
+    With v_scale < 100 only that percentage of rows is stored; the
+    decoder replicates rows back to `height`.
+    """
+    v_scale, chunks = _encode_cel_chunks(pixels, width, height, v_scale, False)
+    data_size    = sum(len(c) for c in chunks)   # 10 + pixel_count
+    if data_size > MAX_CEL_DATA_SIZE:
+        raise ValueError(
+            f"Uncompressed cel data_size {data_size} exceeds uint16 limit. "
+            "Use encode_cel_bands() to split it.")
+
+    num_chunks   = len(chunks)
+    return _cel_header(width, height, x, y, data_size, num_chunks, v_scale) + b''.join(chunks)
 
-    data_size    = len(chunk)
-    if data_size > 65535:
+
+def encode_cel_lzs(pixels: bytes, width: int, height: int,
+                   x: int = 0, y: int = 0, lzs_backend: str = 'auto',
+                   lzs_level: int = 0, v_scale: int = 100):
+    """
+    Build a Robot v5 cel packet using LZS compression.
+    """
+    v_scale, chunks = _encode_cel_chunks(pixels, width, height, v_scale, True,
+                                         lzs_backend, lzs_level)
+    data_size    = sum(len(c) for c in chunks)
+    if data_size > MAX_CEL_DATA_SIZE:
         raise ValueError(
             f"LZS-compressed cel data_size {data_size} still exceeds uint16 limit "
-            f"(compressed {comp_size} from {len(pixels)} raw bytes). "
-            "Try reducing the canvas size.")
+            f"(from {len(pixels)} raw bytes). Use encode_cel_bands() to split it.")
 
-    num_chunks   = 1
-    v_scale      = 100
+    num_chunks   = len(chunks)
+    return _cel_header(width, height, x, y, data_size, num_chunks, v_scale) + b''.join(chunks)
 
-    cel_header   = bytearray(22)
-    cel_header[1]  = v_scale
-    struct.pack_into('<H', cel_header, 2,  width)
-    struct.pack_into('<H', cel_header, 4,  height)
-    struct.pack_into('<H', cel_header, 10, x & 0xFFFF)
-    struct.pack_into('<H', cel_header, 12, y & 0xFFFF)
-    struct.pack_into('<H', cel_header, 14, data_size)
-    struct.pack_into('<H', cel_header, 16, num_chunks)
 
-    return bytes(cel_header) + chunk
+def encode_cel_bands(pixels: bytes, width: int, height: int,
+                     x: int = 0, y: int = 0, use_lzs: bool = False,
+                     lzs_backend: str = 'auto', lzs_level: int = 0,
+                     v_scale: int = 100):
+    """
+    Encode one cel as a list of cel packets.
+
+    A cel that fits the uint16 data_size is a single one-chunk packet, as
+    encode_cel_lzs()/encode_cel_uncompressed() would write it.  Otherwise
+    the cel is cut into horizontal bands; each band becomes a positioned
+    cel whose rows are stored as several chunks of BAND_CHUNK_BYTES, and
+    the band count grows until every band fits.
+    """
+    v_band, chunks = _encode_cel_chunks(pixels, width, height, v_scale, use_lzs,
+                                        lzs_backend, lzs_level)
+    data_size = sum(len(c) for c in chunks)
+    if data_size <= MAX_CEL_DATA_SIZE:
+        return [_cel_header(width, height, x, y, data_size, len(chunks), v_band)
+                + b''.join(chunks)]
+
+    bands = -(-data_size // MAX_CEL_DATA_SIZE)
+    while bands <= height:
+        band_h  = -(-height // bands)
+        packets = []
+        for top in range(0, height, band_h):
+            h = min(band_h, height - top)
+            v_band, chunks = _encode_cel_chunks(
+                pixels[top * width:(top + h) * width], width, h, v_scale,
+                use_lzs, lzs_backend, lzs_level, BAND_CHUNK_BYTES)
+            data_size = sum(len(c) for c in chunks)
+            if data_size > MAX_CEL_DATA_SIZE:
+                break
+            packets.append(_cel_header(width, h, x, y + top, data_size,
+                                       len(chunks), v_band) + b''.join(chunks))
+        else:
+            return packets
+        bands += 1
+
+    raise ValueError(f"Cannot split a {width}-pixel-wide cel into bands that "
+                     f"fit the uint16 data_size limit.")
 
 
 def encode_video_frame(pixels: bytes, width: int, height: int,
-                       use_lzs: bool = False, x: int = 0, y: int = 0):
+                       use_lzs: bool = False, x: int = 0, y: int = 0,
+                       lzs_backend: str = 'auto', lzs_level: int = 0,
+                       v_scale: int = 100):
     """
-    Build a complete Robot video frame blob (2-byte cel count + 1 cel).
+    Build a complete Robot video frame blob (2-byte cel count + 1 cel, or
+    several band cels when the frame is too large for one).
     Returns bytes.
     """
-    if use_lzs:
-        cel_data = encode_cel_lzs(pixels, width, height, x, y)
-    else:
-        cel_data = encode_cel_uncompressed(pixels, width, height, x, y)
+    return encode_frame_cels([(pixels, width, height, x, y)], use_lzs,
+                             lzs_backend, lzs_level, v_scale)
 
-    num_cels = struct.pack('<H', 1)
-    return num_cels + cel_data
+
+def encode_frame_cels(cels, use_lzs: bool = False,
+                      lzs_backend: str = 'auto', lzs_level: int = 0,
+                      v_scale: int = 100):
+    """
+    Build a Robot video frame blob (2-byte cel count + N positioned cels).
+    `cels` is a list of (pixels, width, height, x, y) tuples.
+    """
+    packets = []
+    for pixels, width, height, x, y in cels:
+        packets += encode_cel_bands(pixels, width, height, x, y, use_lzs,
+                                    lzs_backend, lzs_level, v_scale)
+    if len(packets) > MAX_SCREEN_ITEMS:
+        raise ValueError(
+            f"Frame needs {len(packets)} cels after band splitting; the player "
+            f"allows at most {MAX_SCREEN_ITEMS}. Use --lzs or a lower --v-scale.")
+    return struct.pack('<H', len(packets)) + b''.join(packets)
+
+
+def frame_cel_areas(video: bytes):
+    """
+    Read back the area (width × height) of every cel in an encoded video
+    frame blob, in cel order.  Used to fill the header's max_cels and
+    max_cel_area fields.
+    """
+    areas = []
+    num_cels = struct.unpack_from('<H', video, 0)[0]
+    vp = 2
+    for _ in range(num_cels):
+        width, height = struct.unpack_from('<HH', video, vp + 2)
+        data_size     = struct.unpack_from('<H', video, vp + 14)[0]
+        areas.append(width * height)
+        vp += 22 + data_size
+    return areas
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Delta cels (only the regions that differ from a static background plate)
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ScummVM (RobotDecoder::doVersion5) replaces every screen item each frame
+# and deletes the ones a frame no longer has, so cels never persist from
+# one frame to the next: whatever a frame does not cover shows the plane
+# behind the robot.  Delta cels are therefore taken against that static
+# background plate, not against the previous frame.
+
+DEFAULT_MAX_CELS = 4    # kFixedCelListSize: cels with preallocated buffers
+
+
+def _row_diff_span(row: bytes, ref: bytes):
+    """Return (first, last) differing column of two equal-length rows, or None."""
+    if row == ref:
+        return None
+    diff = int.from_bytes(row, 'big') ^ int.from_bytes(ref, 'big')
+    width = len(row)
+    first = width - 1 - (diff.bit_length() - 1) // 8
+    last  = width - 1 - ((diff & -diff).bit_length() - 1) // 8
+    return first, last
+
+
+def find_changed_rects(pixels: bytes, plate: bytes, width: int, height: int,
+                       max_cels: int = DEFAULT_MAX_CELS, merge_gap: int = 8):
+    """
+    Return up to `max_cels` rectangles (x, y, w, h) covering every pixel
+    where `pixels` differs from `plate`.
+
+    Changed rows are grouped into horizontal bands (bands separated by
+    fewer than `merge_gap` unchanged rows are joined — a cel header costs
+    more than a few rows of mostly-matching pixels), then the adjacent
+    pair whose union wastes the least area is merged until the count fits.
+    """
+    bands = []   # [y0, y1, x0, x1] inclusive
+    for y in range(height):
+        off  = y * width
+        span = _row_diff_span(pixels[off:off + width], plate[off:off + width])
+        if span is None:
+            continue
+        x0, x1 = span
+        if bands and y - bands[-1][1] <= merge_gap:
+            band = bands[-1]
+            band[1] = y
+            band[2] = min(band[2], x0)
+            band[3] = max(band[3], x1)
+        else:
+            bands.append([y, y, x0, x1])
+
+    def _area(b):
+        return (b[1] - b[0] + 1) * (b[3] - b[2] + 1)
+
+    def _union(a, b):
+        return [a[0], b[1], min(a[2], b[2]), max(a[3], b[3])]
+
+    while len(bands) > max(1, max_cels):
+        waste = [_area(_union(bands[i], bands[i + 1])) - _area(bands[i]) - _area(bands[i + 1])
+                 for i in range(len(bands) - 1)]
+        i = waste.index(min(waste))
+        bands[i:i + 2] = [_union(bands[i], bands[i + 1])]
+
+    return [(x0, y0, x1 - x0 + 1, y1 - y0 + 1) for y0, y1, x0, x1 in bands]
+
+
+def crop_pixels(pixels: bytes, width: int, x: int, y: int, w: int, h: int) -> bytes:
+    """Return the w × h sub-rectangle at (x, y) of a width-wide pixel buffer."""
+    return b''.join(pixels[(y + row) * width + x:(y + row) * width + x + w]
+                    for row in range(h))
+
+
+def delta_cels(pixels: bytes, plate: bytes, width: int, height: int,
+               max_cels: int = DEFAULT_MAX_CELS):
+    """
+    Split a frame into positioned cels covering only what differs from the
+    background plate, as (pixels, width, height, x, y) tuples.
+
+    A frame identical to the plate still gets one 1×1 cel so that every
+    frame keeps at least one cel for tools that composite frames.
+    """
+    rects = find_changed_rects(pixels, plate, width, height, max_cels)
+    if not rects:
+        rects = [(0, 0, 1, 1)]
+    return [(crop_pixels(pixels, width, x, y, w, h), w, h, x, y)
+            for x, y, w, h in rects]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-frame encoding (serial or multi-process)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FrameCache:
+    """
+    Content-addressed cache of encoded video blobs for --incremental runs.
+
+    One file per frame content, named by the SHA-1 of the encode settings
+    plus the frame's indexed pixels, so unchanged frames are read back
+    instead of compressed again and the output stays byte-identical.
+    Entries are written to a temporary file and renamed into place, which
+    keeps the cache consistent when several workers share it.
+    """
+
+    FORMAT = 1   # bump whenever the encoded blob layout changes
+
+    def __init__(self, cache_dir: str, settings):
+        self.cache_dir = cache_dir
+        self.salt      = repr((self.FORMAT,) + tuple(settings)).encode('utf-8')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, pixels: bytes) -> str:
+        h = hashlib.sha1(self.salt)
+        h.update(pixels)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.bin')
+
+    def keys(self):
+        """Keys of every entry currently in the cache."""
+        return {name[:-4] for name in os.listdir(self.cache_dir)
+                if name.endswith('.bin')}
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, video: bytes):
+        tmp = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(video)
+        os.replace(tmp, self._path(key))
+
+    def prune(self, keep) -> int:
+        """Delete entries not in `keep`; return how many were removed."""
+        removed = 0
+        for key in self.keys() - set(keep):
+            try:
+                os.remove(self._path(key))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class FrameEncoder:
+    """
+    Turns one frame image file into an encoded Robot video frame blob.
+
+    Holds every per-run setting needed to encode a frame so that a single
+    picklable object can be handed to worker processes; the serial path
+    uses the very same object, which keeps both paths byte-identical.
+    """
+
+    def __init__(self, canvas_w: int, canvas_h: int, pal_colors,
+                 use_lzs: bool = False, lzs_backend: str = 'auto',
+                 lzs_level: int = 0, plate: bytes = None,
+                 max_cels: int = DEFAULT_MAX_CELS, v_scale: int = 100):
+        self.canvas_w    = canvas_w
+        self.canvas_h    = canvas_h
+        self.pal_colors  = pal_colors
+        self.use_lzs     = use_lzs
+        self.lzs_backend = lzs_backend
+        self.lzs_level   = lzs_level
+        self.plate       = plate        # indexed background plate for delta cels
+        self.max_cels    = max_cels
+        self.v_scale     = v_scale
+        self.cache       = None         # FrameCache for --incremental runs
+
+    def cache_settings(self):
+        """Everything besides the pixels that shapes an encoded frame."""
+        plate = hashlib.sha1(self.plate).hexdigest() if self.plate is not None else None
+        return (self.canvas_w, self.canvas_h, self.use_lzs, self.lzs_backend,
+                self.lzs_level, self.v_scale, plate,
+                self.max_cels if plate else None)
+
+    def load_indexed(self, fpath: str) -> bytes:
+        """Load a frame image, fit it to the canvas and return indexed pixels."""
+        from PIL import Image
+
+        img = Image.open(fpath)
+        if img.size != (self.canvas_w, self.canvas_h):
+            # Paletted images must be converted to RGB before a quality resize
+            # (LANCZOS on mode 'P' produces garbage — it interpolates indices).
+            if img.mode == 'P':
+                img = img.convert('RGB')
+            img = img.resize((self.canvas_w, self.canvas_h), Image.LANCZOS)
+        return image_to_indexed(img, self.pal_colors)
+
+    def encode_file(self, fpath: str) -> bytes:
+        return self.encode_entry(fpath)[0]
+
+    def encode_entry(self, fpath: str):
+        """
+        Encode one frame file; returns (video, cache key).  With a cache
+        attached, a frame whose indexed pixels were encoded before is read
+        back from it; otherwise the key is None.
+        """
+        pixels = self.load_indexed(fpath)
+        if self.cache is None:
+            return self.encode_pixels(pixels), None
+        key   = self.cache.key(pixels)
+        video = self.cache.get(key)
+        if video is None:
+            video = self.encode_pixels(pixels)
+            self.cache.put(key, video)
+        return video, key
+
+    def encode_pixels(self, pixels: bytes) -> bytes:
+        if self.plate is not None:
+            cels = delta_cels(pixels, self.plate, self.canvas_w, self.canvas_h,
+                              self.max_cels)
+            return encode_frame_cels(cels, self.use_lzs, self.lzs_backend,
+                                     self.lzs_level, self.v_scale)
+        return encode_video_frame(pixels, self.canvas_w, self.canvas_h,
+                                  self.use_lzs, lzs_backend=self.lzs_backend,
+                                  lzs_level=self.lzs_level, v_scale=self.v_scale)
+
+
+_worker_encoder = None
+
+
+def _init_frame_worker(encoder: FrameEncoder):
+    global _worker_encoder
+    _worker_encoder = encoder
+
+
+def _encode_frame_in_worker(fpath: str):
+    return _worker_encoder.encode_entry(fpath)
+
+
+def encode_frame_files(frame_files, encoder: FrameEncoder, jobs: int = 1):
+    """
+    Yield (video blob, cache key) for every file in `frame_files`, in order.
+
+    With jobs > 1 the frames are encoded by a process pool; results are
+    still yielded strictly in frame order, one as soon as it is ready.
+    """
+    if jobs <= 1:
+        for fpath in frame_files:
+            yield encoder.encode_entry(fpath)
+        return
+
+    with multiprocessing.Pool(jobs, initializer=_init_frame_worker,
+                              initargs=(encoder,)) as pool:
+        for entry in pool.imap(_encode_frame_in_worker, frame_files):
+            yield entry
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Streaming file writer
+# ─────────────────────────────────────────────────────────────────────────────
+
+RBT_HEADER_SIZE = 60      # 6-byte preamble + 54-byte file header
+RBT_NUM_CUES    = 256
+RBT_SECTOR      = 2048    # frame data starts on a sector boundary
+_SHIFT_BLOCK    = 1 << 20
+
+
+class RBTWriter:
+    """
+    Write a Robot file frame by frame with bounded memory.
+
+    The header, palette, size tables and cue tables in front of the frame
+    data are reserved up front and filled in by close(); each frame packet
+    goes to disk as soon as write_frame() receives it.  Only the per-frame
+    sizes are kept in memory.
+
+    Frames are laid out for v5 (uint16 size tables) unless `force_v6`.  If
+    a frame turns out not to fit v5, close() upgrades to v6; when the wider
+    tables push the first frame onto a later sector, the frame data is
+    moved forward in place, block by block from the end of the file.
+
+    `primer` is written verbatim between header and palette (its length is
+    the header's primer_reserved_size); `cue_times`/`cue_values` default to
+    256 inactive cues.  max_cels_per_frame and max_cel_area are derived from
+    the cels actually written.
+    """
+
+    def __init__(self, path: str, num_frames: int, hunk_pal: bytes,
+                 fps: int = 15, audio_block_size: int = 0,
+                 has_audio: bool = False, force_v6: bool = False,
+                 is_hi_res: int = 1, x_res: int = 0, y_res: int = 0,
+                 primer: bytes = b'', primer_zero_compress: int = None,
+                 max_skippable: int = 0, cue_times=None, cue_values=None):
+        self.path             = path
+        self.num_frames       = num_frames
+        self.hunk_pal         = bytes(hunk_pal)
+        self.fps              = fps
+        self.audio_block_size = audio_block_size
+        self.has_audio        = has_audio
+        self.is_hi_res        = is_hi_res
+        self.x_res            = x_res
+        self.y_res            = y_res
+        self.primer           = bytes(primer)
+        if primer_zero_compress is None:
+            primer_zero_compress = 1 if has_audio and not primer else 0
+        self.primer_zero_compress = primer_zero_compress
+        self.max_skippable    = max_skippable
+        self.cue_times        = list(cue_times) if cue_times else [-1] * RBT_NUM_CUES
+        self.cue_values       = list(cue_values) if cue_values else [0] * RBT_NUM_CUES
+
+        self.version      = 6 if force_v6 else 5
+        self.video_sizes  = []
+        self.packet_sizes = []
+        self.slot_areas   = []   # largest cel area seen in each cel slot
+
+        self._data_start  = self.data_offset(self.version)
+        self._f = open(path, 'w+b')
+        self._f.seek(self._data_start)
+
+    def data_offset(self, version: int) -> int:
+        """File offset of the first frame packet for the given version."""
+        entry = 2 if version == 5 else 4
+        pos = (RBT_HEADER_SIZE + len(self.primer) + len(self.hunk_pal)
+               + 2 * entry * self.num_frames + RBT_NUM_CUES * (4 + 2))
+        return -(-pos // RBT_SECTOR) * RBT_SECTOR
+
+    def write_frame(self, video: bytes, audio: bytes = b''):
+        """Append one frame packet: the video blob followed by its audio block."""
+        if len(self.video_sizes) >= self.num_frames:
+            raise ValueError(f"More than the {self.num_frames} declared frames written")
+        self._f.write(video)
+        if audio:
+            self._f.write(audio)
+        self.video_sizes.append(len(video))
+        self.packet_sizes.append(len(video) + len(audio))
+        for i, area in enumerate(frame_cel_areas(video)):
+            if i == len(self.slot_areas):
+                self.slot_areas.append(area)
+            else:
+                self.slot_areas[i] = max(self.slot_areas[i], area)
+
+    def needs_v6(self) -> bool:
+        """True if some video or packet size does not fit a v5 uint16 table."""
+        return (max(self.video_sizes, default=0) > 65535 or
+                max(self.packet_sizes, default=0) > 65535)
+
+    def _move_data(self, new_start: int):
+        """Shift the frame data forward to `new_start`, copying from the end."""
+        f    = self._f
+        size = sum(self.packet_sizes)
+        end  = size
+        while end > 0:
+            n = min(_SHIFT_BLOCK, end)
+            f.seek(self._data_start + end - n)
+            block = f.read(n)
+            f.seek(new_start + end - n)
+            f.write(block)
+            end -= n
+        self._data_start = new_start
+
+    def _build_prelude(self) -> bytes:
+        out = bytearray()
+
+        # — Preamble: 0x16, unused, 'SOL\0' —
+        out += bytes([0x16, 0x00])
+        out += b'SOL\x00'
+
+        # — File header (starts at offset 6) —
+        max_cels_used = max(1, len(self.slot_areas))
+        out += struct.pack('<H', self.version)
+        out += struct.pack('<H', self.audio_block_size)
+        out += struct.pack('<h', self.primer_zero_compress)
+        out += bytes(2)                         # unused
+        out += struct.pack('<H', self.num_frames)
+        out += struct.pack('<H', len(self.hunk_pal))
+        out += struct.pack('<H', len(self.primer))
+        out += struct.pack('<h', self.x_res)
+        out += struct.pack('<h', self.y_res)
+        out += bytes([1])                        # has_palette = 1
+        out += bytes([1 if self.has_audio else 0])   # has_audio
+        out += bytes(2)                          # unused
+        out += struct.pack('<h', self.fps)       # frame_rate
+        out += struct.pack('<h', self.is_hi_res)
+        out += struct.pack('<h', self.max_skippable)
+        out += struct.pack('<h', max_cels_used)  # max_cels_per_frame
+        # max_cel_area × 4 (4 × sint32): largest cel of each of the first four
+        # cel slots; slots no frame uses repeat the largest area.
+        largest = max(self.slot_areas, default=0)
+        for i in range(4):
+            out += struct.pack('<i', self.slot_areas[i] if i < len(self.slot_areas) else largest)
+        out += bytes(8)                          # reserved
+        assert len(out) == RBT_HEADER_SIZE, f"Header size mismatch: {len(out)}"
+
+        # — Audio primer (verbatim, usually absent: zero-compress flag) —
+        out += self.primer
+
+        # — Palette —
+        out += self.hunk_pal
+
+        # — Video frame size and packet size indexes —
+        fmt = '<H' if self.version == 5 else '<i'
+        for vs in self.video_sizes:
+            out += struct.pack(fmt, vs)
+        for ps in self.packet_sizes:
+            out += struct.pack(fmt, ps)
+
+        # — Cue times (256 × sint32) and cue values (256 × uint16) —
+        for t in self.cue_times:
+            out += struct.pack('<i', t)
+        for v in self.cue_values:
+            out += struct.pack('<H', v)
+
+        # — Align to 2048-byte boundary —
+        rem = len(out) % RBT_SECTOR
+        if rem:
+            out += bytes(RBT_SECTOR - rem)
+        return bytes(out)
+
+    def close(self) -> int:
+        """Finish the file: pick the version, fill in the prelude. Returns the version."""
+        if len(self.video_sizes) != self.num_frames:
+            raise ValueError(f"Expected {self.num_frames} frames, "
+                             f"got {len(self.video_sizes)}")
+        if self.version == 5 and self.needs_v6():
+            self.version = 6
+        new_start = self.data_offset(self.version)
+        if new_start != self._data_start:
+            self._move_data(new_start)
+
+        prelude = self._build_prelude()
+        assert len(prelude) == self._data_start
+        self._f.seek(0)
+        self._f.write(prelude)
+        self._f.truncate(self._data_start + sum(self.packet_sizes))
+        self._f.close()
+        return self.version
+
+    def abort(self):
+        """Close and delete a partly written file."""
+        self._f.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        elif not self._f.closed:
+            self.close()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -682,9 +1692,29 @@ def encode_video_frame(pixels: bytes, width: int, height: int,
 def encode_rbt(frames_dir: str, output_path: str, fps: int = 15,
                audio_path: str = None, palette_path: str = None,
                canvas_w: int = 0, canvas_h: int = 0,
-               use_lzs: bool = False, force_v6: bool = False):
+               use_lzs: bool = False, force_v6: bool = False,
+               jobs: int = 1, lzs_backend: str = 'auto',
+               lzs_level: int = 0, delta_path: str = None,
+               max_cels: int = DEFAULT_MAX_CELS, v_scale: int = 100,
+               incremental: bool = False, cache_dir: str = None):
     """
     Encode a folder of frames (and optional audio) into a Robot .rbt file.
+
+    `jobs` > 1 spreads frame quantization and compression over that many
+    worker processes (0 = one per CPU).  The output is identical to a
+    serial run.
+
+    `delta_path` names a background plate image (the scene the game shows
+    behind the robot); each frame then stores only the rectangles that
+    differ from it, as up to `max_cels` positioned cels.
+
+    `v_scale` < 100 stores only that percentage of each cel's rows (the
+    decoder replicates rows back), as Sierra did for hi-res cutscenes.
+
+    `incremental` keeps the encoded frames in a content-addressed cache
+    (`cache_dir`, default `<output>.cache`) so that a re-run only
+    compresses frames whose indexed pixels changed.  Entries no frame of
+    this run used are pruned afterwards.
     """
     try:
         from PIL import Image
@@ -722,11 +1752,17 @@ def encode_rbt(frames_dir: str, output_path: str, fps: int = 15,
     palette_size = len(hunk_pal)                 # 1200
 
     # ── Encode all video frames ──────────────────────────────────────────────
-    raw_pixel_size   = canvas_w * canvas_h
+    if not 1 <= v_scale <= 100:
+        raise ValueError(f"v_scale must be between 1 and 100, got {v_scale}")
+    stored_rows      = (canvas_h * v_scale) // 100 if v_scale < 100 else canvas_h
+    raw_pixel_size   = canvas_w * max(1, stored_rows)
     # The cel header's data_size field (bytes 14-15) is ALWAYS uint16 in the
     # Robot format.  If the uncompressed chunk (10-byte chunk header + raw pixels)
-    # exceeds 65535, LZS compression is mandatory.
+    # exceeds 65535 the frame would have to be split into band cels, so LZS
+    # compression is switched on instead.
     uncompressed_chunk = 10 + raw_pixel_size
+    if v_scale < 100:
+        print(f"  Vertical scale: {v_scale}% ({max(1, stored_rows)} of {canvas_h} rows stored)")
     if uncompressed_chunk > 65535:
         if not use_lzs:
             print(f"  Frame size {raw_pixel_size} px exceeds uint16 limit — "
@@ -736,32 +1772,38 @@ def encode_rbt(frames_dir: str, output_path: str, fps: int = 15,
     # v6 is forced if the user requested it; otherwise we start with v5 and
     # upgrade AFTER compression once we know the real per-frame sizes.
     version = 6 if force_v6 else 5
+    if use_lzs:
+        lzs_backend = resolve_lzs_backend(lzs_backend)
     print(f"  Robot version: v{version} (tentative)  "
-          f"compression: {'LZS' if use_lzs else 'none'}")
-
-    encoded_videos = []
-    pbar = ProgressBar(num_frames, label='Encoding frames')
-    for fpath in frame_files:
-        img = Image.open(fpath)
-        if img.size != (canvas_w, canvas_h):
-            # Paletted images must be converted to RGB before a quality resize
-            # (LANCZOS on mode 'P' produces garbage — it interpolates indices).
-            if img.mode == 'P':
-                img = img.convert('RGB')
-            img = img.resize((canvas_w, canvas_h), Image.LANCZOS)
-        pixels = image_to_indexed(img, pal_colors)
-        vid    = encode_video_frame(pixels, canvas_w, canvas_h, use_lzs)
-        encoded_videos.append(vid)
-        pbar.step()
-    pbar.finish()
-
-    video_sizes  = [len(v) for v in encoded_videos]
+          f"compression: {f'LZS level {lzs_level} ({lzs_backend})' if use_lzs else 'none'}")
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, num_frames)
+    if jobs > 1:
+        print(f"  Encoding with {jobs} worker processes")
+
+    encoder = FrameEncoder(canvas_w, canvas_h, pal_colors, use_lzs,
+                           lzs_backend, lzs_level, v_scale=v_scale)
+    if delta_path:
+        if not 1 <= max_cels <= MAX_SCREEN_ITEMS:
+            raise ValueError(f"max_cels must be between 1 and {MAX_SCREEN_ITEMS}")
+        encoder.plate    = encoder.load_indexed(delta_path)
+        encoder.max_cels = max_cels
+        print(f"  Delta cels against plate '{delta_path}' (up to {max_cels} cels/frame)")
+    cached_keys = set()
+    if incremental:
+        cache_dir = cache_dir or output_path + '.cache'
+        encoder.cache = FrameCache(cache_dir, encoder.cache_settings())
+        cached_keys = encoder.cache.keys()
+        print(f"  Incremental: cache '{cache_dir}' ({len(cached_keys)} entries)")
 
     # ── Encode audio ─────────────────────────────────────────────────────────
+    # Audio comes first so each frame packet can be written as soon as its
+    # video is encoded.
     has_audio = False
     audio_blocks = []
     audio_block_size = 0
-    samples_per_block = 0
 
     if audio_path:
         if 22050 % fps != 0:
@@ -775,37 +1817,8 @@ def encode_rbt(frames_dir: str, output_path: str, fps: int = 15,
         has_audio = True
         print(f"  Audio encoded: {len(audio_blocks)} blocks × {audio_block_size} bytes")
 
-    # ── Build packet sizes ───────────────────────────────────────────────────
-    packet_sizes = []
-    for vs in video_sizes:
-        ps = vs + (audio_block_size if has_audio else 0)
-        packet_sizes.append(ps)
-
-    # Determine final version: upgrade to v6 only if actual compressed sizes
-    # exceed uint16 (LZS often brings 640×480 frames well under 65535).
-    if version == 5:
-        max_vs = max(video_sizes) if video_sizes else 0
-        max_ps = max(packet_sizes) if packet_sizes else 0
-        if max_vs > 65535 or max_ps > 65535:
-            print(f"  Auto-upgrading to v6 (max video={max_vs}, max packet={max_ps})")
-            version = 6
-    print(f"  Robot version: v{version}  (final)")
-
-    # ── Write file ───────────────────────────────────────────────────────────
-    print(f"  Writing '{output_path}' ...")
-    out = bytearray()
-
-    # — Preamble: 0x16, unused, 'SOL\0' —
-    out += bytes([0x16, 0x00])
-    out += b'SOL\x00'
-
-    # — File header (starts at offset 6) —
-    primer_reserved_size  = 0
-    primer_zero_compress  = 1 if has_audio else 0
     # Original Sierra RBT files store 0×0 for x_res/y_res; ScummVM ignores this
     # field and uses the per-cel dimensions from the frame data instead.
-    x_res = 0
-    y_res = 0
     # is_hi_res: 1 for hi-res (SCI2+) games; canvas_w >= 320 matches originals.
     is_hi_res = 1 if canvas_w >= 320 else 0
     # maxSkippable: Sierra formula — audio_block_size / (audioRecordInterval/4) - 1
@@ -813,79 +1826,49 @@ def encode_rbt(frames_dir: str, output_path: str, fps: int = 15,
     quarter_interval = max(1, (22050 // fps) // 4) if fps > 0 else 1
     max_skippable = max(0, (audio_block_size // quarter_interval) - 1) if has_audio else 0
 
-    out += struct.pack('<H', version)
-    out += struct.pack('<H', audio_block_size)
-    out += struct.pack('<h', primer_zero_compress)
-    out += bytes(2)                         # unused
-    out += struct.pack('<H', num_frames)
-    out += struct.pack('<H', palette_size)
-    out += struct.pack('<H', primer_reserved_size)
-    out += struct.pack('<h', x_res)
-    out += struct.pack('<h', y_res)
-    out += bytes([1])                        # has_palette = 1
-    out += bytes([1 if has_audio else 0])   # has_audio
-    out += bytes(2)                          # unused
-    out += struct.pack('<h', fps)            # frame_rate
-    out += struct.pack('<h', is_hi_res)
-    out += struct.pack('<h', max_skippable)
-    out += struct.pack('<h', 1)             # max_cels_per_frame = 1
-    # max_cel_area × 4 (4 × sint32)
-    cel_area = canvas_w * canvas_h
-    for _ in range(4):
-        out += struct.pack('<i', cel_area)
-    out += bytes(8)                          # reserved
-
-    # Assert: we're now at byte 60 (= 6 + 54 bytes of header)
-    assert len(out) == 60, f"Header size mismatch: {len(out)}"
-
-    # — No primer audio in file (using zero-compress flag) —
-
-    # — Palette —
-    out += hunk_pal                          # 1200 bytes
-
-    # — Video frame size index —
-    if version == 5:
-        for vs in video_sizes:
-            out += struct.pack('<H', vs)
-    else:
-        for vs in video_sizes:
-            out += struct.pack('<i', vs)
-
-    # — Packet size index —
-    if version == 5:
-        for ps in packet_sizes:
-            out += struct.pack('<H', ps)
-    else:
-        for ps in packet_sizes:
-            out += struct.pack('<i', ps)
-
-    # — Cue times (256 × sint32, all -1 = inactive) —
-    for _ in range(256):
-        out += struct.pack('<i', -1)
-
-    # — Cue values (256 × uint16, all 0) —
-    for _ in range(256):
-        out += struct.pack('<H', 0)
-
-    # — Align to 2048-byte boundary —
-    rem = len(out) % 2048
-    if rem:
-        out += bytes(2048 - rem)
-
-    # — Frame data —
-    for i in range(num_frames):
-        out += encoded_videos[i]
-        if has_audio:
-            out += audio_blocks[i]
-
-        if (i + 1) % 100 == 0:
-            print(f"    Written {i+1}/{num_frames} frames ...")
-
-    # — Write to disk —
-    with open(output_path, 'wb') as f:
-        f.write(out)
+    # ── Encode video frames straight to disk ─────────────────────────────────
+    print(f"  Writing '{output_path}' ...")
+    writer = RBTWriter(output_path, num_frames, hunk_pal, fps,
+                       audio_block_size, has_audio, force_v6,
+                       is_hi_res=is_hi_res, max_skippable=max_skippable)
+    used_keys = set()
+    reused    = 0
+    with writer:
+        pbar = ProgressBar(num_frames, label='Encoding frames')
+        entries = encode_frame_files(frame_files, encoder, jobs)
+        for i, (vid, key) in enumerate(entries):
+            writer.write_frame(vid, audio_blocks[i] if has_audio else b'')
+            if key is not None:
+                reused += key in cached_keys
+                used_keys.add(key)
+            pbar.step()
+        pbar.finish()
+        if incremental:
+            pruned = encoder.cache.prune(used_keys)
+            print(f"  Incremental: {reused} frames reused, "
+                  f"{num_frames - reused} encoded, {pruned} stale cache entries pruned")
+
+        video_sizes = writer.video_sizes
+        slot_areas  = writer.slot_areas
+        if delta_path:
+            print(f"  Cels: up to {max(1, len(slot_areas))} per frame, "
+                  f"slot areas {slot_areas[:4]}")
+        if use_lzs:
+            raw_total = raw_pixel_size * num_frames
+            print(f"  Video: {raw_total/1024/1024:.1f} MB of pixels -> "
+                  f"{sum(video_sizes)/1024/1024:.1f} MB "
+                  f"(ratio {raw_total / max(1, sum(video_sizes)):.2f}x, "
+                  f"LZS level {lzs_level}, largest frame {max(video_sizes)} bytes)")
+
+        # Upgrade to v6 only if actual compressed sizes exceed uint16 (LZS
+        # often brings 640×480 frames well under 65535).
+        if writer.version == 5 and writer.needs_v6():
+            print(f"  Auto-upgrading to v6 (max video={max(video_sizes)}, "
+                  f"max packet={max(writer.packet_sizes)})")
+        version = writer.close()
+    print(f"  Robot version: v{version}  (final)")
 
-    size_mb = len(out) / 1024 / 1024
+    size_mb = os.path.getsize(output_path) / 1024 / 1024
     print(f"  Done. {output_path} written ({size_mb:.1f} MB, "
           f"{num_frames} frames, {fps} fps).")
 
@@ -917,8 +1900,30 @@ def main():
                          'Overrides --canvas-width / --canvas-height.')
     ap.add_argument('--lzs', action='store_true',
                     help='Compress video with LZS (smaller file, slower encode)')
+    ap.add_argument('--lzs-backend', default='auto',
+                    choices=('auto',) + LZS_BACKENDS,
+                    help='LZS compressor implementation (default: fastest available)')
+    ap.add_argument('--lzs-level', type=int, default=0, choices=LZSEncoder.LEVELS,
+                    help='LZS parse: 0=greedy (default), 1=lazy, 2=optimal (smallest, slowest)')
+    ap.add_argument('--delta', default=None, metavar='PLATE',
+                    help='Background plate image shown behind the robot: store only the '
+                         'regions of each frame that differ from it, as positioned cels')
+    ap.add_argument('--max-cels', type=int, default=DEFAULT_MAX_CELS,
+                    help=f'Cels per frame in --delta mode (default: {DEFAULT_MAX_CELS}, '
+                         f'max {MAX_SCREEN_ITEMS})')
+    ap.add_argument('--v-scale', type=int, default=100,
+                    help='Store only this percentage of each cel\'s rows (1-100, default: 100); '
+                         'the player replicates rows back to full height')
+    ap.add_argument('--incremental', action='store_true',
+                    help='Cache encoded frames next to the output and only re-encode '
+                         'frames whose pixels changed since the last run')
+    ap.add_argument('--cache-dir', default=None,
+                    help='Frame cache directory for --incremental '
+                         '(default: <output>.cache; implies --incremental)')
     ap.add_argument('--v6', action='store_true',
                     help='Force v6 format (needed for frames > ~64KB uncompressed)')
+    ap.add_argument('--jobs', '-j', type=int, default=1,
+                    help='Worker processes for frame encoding (default: 1; 0 = one per CPU)')
     args = ap.parse_args()
 
     canvas_w = args.canvas_width
@@ -928,9 +1933,10 @@ def main():
     if args.match_rbt:
         try:
             import parse_rbt as _pr
-            _hdr, _pal, _frames, *_ = _pr.parse_rbt(args.match_rbt, verbose=False)
-            if _frames and _frames[0].cels:
-                ref_cel = _frames[0].cels[0]
+            with _pr.RobotFile(args.match_rbt) as _rbt:
+                _first = _rbt[0] if len(_rbt) else None
+            if _first and _first.cels:
+                ref_cel = _first.cels[0]
                 canvas_w = ref_cel.width
                 canvas_h = ref_cel.height
                 print(f"  Matched original RBT dimensions: {canvas_w}×{canvas_h} "
@@ -961,6 +1967,14 @@ def main():
         canvas_h     = canvas_h,
         use_lzs      = args.lzs,
         force_v6     = args.v6,
+        jobs         = args.jobs,
+        lzs_backend  = args.lzs_backend,
+        lzs_level    = args.lzs_level,
+        delta_path   = args.delta,
+        max_cels     = args.max_cels,
+        v_scale      = args.v_scale,
+        incremental  = args.incremental or bool(args.cache_dir),
+        cache_dir    = args.cache_dir,
     )
 
 
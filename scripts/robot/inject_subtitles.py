@@ -1,5 +1,9 @@
 import argparse
+import functools
+import multiprocessing
+import os
 import re
+import shutil
 import struct
 from pathlib import Path
 
@@ -9,6 +13,10 @@ from PIL import Image
 FRAME_LINE_RE = re.compile(r"^\s*(\d+)\s*\|(.*)$")
 FRAME_FILE_RE = re.compile(r"(\d+)")
 
+# Frames per worker task in --jobs mode (a subtitle span is split into
+# batches of this size so long spans still spread across workers).
+SPAN_BATCH = 32
+
 
 def parse_sci_font(font_path: Path):
     """Return (glyphs, line_height) where glyphs maps char_index -> (width, height, bitmap_bytes)."""
@@ -42,6 +50,12 @@ def parse_sci_font(font_path: Path):
     return glyphs, line_height
 
 
+@functools.lru_cache(maxsize=None)
+def load_sci_font(font_path: str):
+    """parse_sci_font, cached per font file."""
+    return parse_sci_font(Path(font_path))
+
+
 def cp1255_index_for_char(ch: str):
     try:
         b = ch.encode("cp1255")
@@ -69,19 +83,138 @@ def text_glyphs_and_width(text: str, glyphs):
     return out, total_width
 
 
-def draw_glyph(img: Image.Image, glyph, x_position: int, y_position: int, color_index: int = 255):
+def glyph_mask(glyph) -> Image.Image:
+    """Return a glyph's bitmap as a 1-bit mask image.
+
+    SCI font rows are MSB-first and padded to whole bytes, which is exactly
+    Pillow's raw "1" layout.
+    """
     width, height, bitmap = glyph
-    bytes_per_row = (width + 7) // 8
-    for y in range(height):
-        for x in range(width):
-            byte_index = y * bytes_per_row + (x // 8)
-            bit_index = 7 - (x % 8)
-            bit = (bitmap[byte_index] >> bit_index) & 1
-            if bit:
-                target_x = x_position + x
-                target_y = y_position + y
-                if 0 <= target_x < img.width and 0 <= target_y < img.height:
-                    img.putpixel((target_x, target_y), color_index)
+    return Image.frombytes("1", (width, height), bytes(bitmap))
+
+
+@functools.lru_cache(maxsize=256)
+def render_line_mask(font_path: str, line_text: str):
+    """Rasterise one subtitle line once; return (mask, text_width, first_char_index, first_width).
+
+    The first letter is drawn at the right and the rest continue right-to-left,
+    as draw_glyph calls used to place them, so the first letter sits at
+    x = text_width - first_width inside the mask.  Colour is applied when the
+    mask is pasted, so one mask serves every frame and colour.  Returns None
+    if no character of the line is in the font.
+    """
+    glyphs, _line_height = load_sci_font(font_path)
+    glyph_items, text_width = text_glyphs_and_width(line_text, glyphs)
+    if not glyph_items:
+        return None
+
+    first_char_index, _first_glyph, first_width = glyph_items[0]
+    mask = Image.new("1", (text_width, max(glyph[1] for _, glyph, _ in glyph_items)), 0)
+    cursor_x = text_width - first_width
+    for i, (_char_index, glyph, glyph_width) in enumerate(glyph_items):
+        if i:
+            cursor_x -= glyph_width
+        bits = glyph_mask(glyph)
+        mask.paste(bits, (cursor_x, 0), bits)
+    return mask, text_width, first_char_index, first_width
+
+
+def draw_glyph(img: Image.Image, glyph, x_position: int, y_position: int, color_index: int = 255):
+    bits = glyph_mask(glyph)
+    img.paste(color_index, (x_position, y_position, x_position + bits.width, y_position + bits.height), bits)
+
+
+def detect_paint_color_index(img: Image.Image, frame_num: int):
+    """Return the palette index closest to white (255 without a palette), logging the choice."""
+    return paint_color_index_for_palette(img.getpalette(), frame_num)
+
+
+def paint_color_index_for_palette(pal, frame_num: int):
+    """detect_paint_color_index for a flat [r, g, b, ...] palette list (or None)."""
+    if pal is None:
+        print(f"frame {frame_num}: palette=None, fallback paint color index=255")
+        return 255
+    triples = [tuple(pal[i:i + 3]) for i in range(0, min(len(pal), 256 * 3), 3)]
+    most_white_index, most_white_rgb = min(
+        enumerate(triples),
+        key=lambda item: sum((255 - channel) ** 2 for channel in item[1]),
+    )
+    print(f"frame {frame_num}: using most white index={most_white_index} rgb={most_white_rgb}")
+    return most_white_index
+
+
+def has_subtitle_text(text: str) -> bool:
+    return any(part.strip() for part in text.split("#"))
+
+
+def draw_subtitle(out: Image.Image, frame_num: int, text: str, font_path: str,
+                  y_position: int, paint_color_index: int):
+    """Draw the '#'-separated lines of `text` onto `out`; return the log lines."""
+    log = []
+    _glyphs, line_height = load_sci_font(font_path)
+    max_width = int((out.width / 2) * 0.8)
+
+    for line_index, raw_line in enumerate(text.split("#")):
+        line_text = raw_line.strip()
+        if not line_text:
+            continue
+
+        line = render_line_mask(font_path, line_text)
+        if line is None:
+            continue
+        mask, text_width, first_char_index, first_width = line
+
+        if text_width > max_width:
+            raise ValueError(
+                f"frame {frame_num}: subtitle line too wide ({text_width}px) > max ({max_width}px): {line_text}"
+            )
+
+        first_x = int((out.width * 0.05) + max_width - ((max_width - text_width) / 2) - first_width)
+        line_y = y_position + line_index * line_height
+        log.append(
+            f"frame {frame_num}: line {line_index} first char index={first_char_index}, "
+            f"text width={text_width}px, max width={max_width}px, first x={first_x}, y={line_y}"
+        )
+
+        # First letter at first_x, the rest of the line to its left.
+        left = first_x - (text_width - first_width)
+        out.paste(
+            paint_color_index,
+            (left, line_y, left + mask.width, line_y + mask.height),
+            mask,
+        )
+    return log
+
+
+def link_or_copy(src: Path, dst: Path):
+    """Make dst a byte-for-byte copy of src: a hard link where possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def process_frames(task):
+    """Worker: write the output of each (frame_num, src, out_path, text) in task; return the log lines."""
+    frames, font_path, y_position, paint_color_index = task
+    log = []
+    for frame_num, src, out_path, text in frames:
+        if not has_subtitle_text(text):
+            if out_path.resolve() != src.resolve():
+                # Replace, never write through: an earlier run may have
+                # hard-linked this output to its source frame.
+                if out_path.exists() or out_path.is_symlink():
+                    out_path.unlink()
+                link_or_copy(src, out_path)
+            continue
+        if out_path.resolve() != src.resolve():
+            if out_path.exists() or out_path.is_symlink():
+                out_path.unlink()
+        with Image.open(src) as img:
+            out = img.copy()
+        log += draw_subtitle(out, frame_num, text, font_path, y_position, paint_color_index)
+        out.save(out_path)
+    return log
 
 
 def build_frame_map(frames_dir: Path):
@@ -120,6 +253,33 @@ def parse_subtitle_markers(path: Path):
     return markers
 
 
+def build_timeline(markers, start_frame: int, end_frame: int):
+    """Return [(frame_num, text)] for start_frame..end_frame (inclusive).
+
+    Frames before the first marker get no subtitle; each marker's text then
+    runs until the frame before the next marker.
+    """
+    timeline = []
+    first_marker_frame = markers[0][0]
+    timeline += [(f, "") for f in range(start_frame, min(first_marker_frame, end_frame + 1))]
+    for i, (start, text, _line_no) in enumerate(markers):
+        if i + 1 < len(markers):
+            end = markers[i + 1][0] - 1
+        else:
+            end = end_frame
+
+        if end < start:
+            continue
+
+        span_start = max(start, start_frame)
+        span_end = min(end, end_frame)
+        if span_end < span_start:
+            continue
+
+        timeline += [(f, text) for f in range(span_start, span_end + 1)]
+    return timeline
+
+
 def find_max_frame_from_dir(frames_dir: Path):
     if not frames_dir.exists() or not frames_dir.is_dir():
         raise ValueError(f"Frames directory not found: {frames_dir}")
@@ -180,6 +340,13 @@ def main():
         default=0,
         help="Add this signed offset to each subtitle marker frame number",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for drawing frames (0 = one per CPU)",
+    )
     args = parser.parse_args()
 
     subtitles_path = Path(args.subtitles)
@@ -191,7 +358,7 @@ def main():
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    glyphs, line_height = parse_sci_font(font_path)
+    _glyphs, line_height = load_sci_font(str(font_path))
     frame_map = build_frame_map(frames_dir)
     if not frame_map:
         raise ValueError(f"Could not detect frame files in {frames_dir}")
@@ -209,105 +376,40 @@ def main():
         timeline_end = min(timeline_end, args.to_frame)
 
     start_print = max(0, args.from_frame)
-    paint_color_index = None
 
-    def process_frame(frame_num: int, text: str):
-        nonlocal paint_color_index
-        src = frame_map.get(frame_num)
-        if src is None:
-            return
+    timeline = build_timeline(markers, start_print, timeline_end)
 
-        with Image.open(src) as img:
-            out = img.copy()
+    jobs = [(f, frame_map[f], output_dir / frame_map[f].name, text)
+            for f, text in timeline if f in frame_map]
+    if not jobs:
+        return
 
-            if paint_color_index is None:
-                pal = out.getpalette()
-                if pal is None:
-                    paint_color_index = 255
-                    print(f"frame {frame_num}: palette=None, fallback paint color index={paint_color_index}")
-                else:
-                    triples = [tuple(pal[i:i + 3]) for i in range(0, min(len(pal), 256 * 3), 3)]
-                    most_white_index, most_white_rgb = min(
-                        enumerate(triples),
-                        key=lambda item: sum((255 - channel) ** 2 for channel in item[1]),
-                    )
-                    paint_color_index = most_white_index
-                    print(f"frame {frame_num}: using most white index={most_white_index} rgb={most_white_rgb}")
-
-            if text:
-                split_lines = text.split("#")
-                base_y = args.y_position
-                max_width = int((out.width / 2) * 0.8)
-
-                for line_index, raw_line in enumerate(split_lines):
-                    line_text = raw_line.strip()
-                    if not line_text:
-                        continue
-
-                    glyph_items, text_width = text_glyphs_and_width(line_text, glyphs)
-                    if not glyph_items:
-                        continue
-
-                    if text_width > max_width:
-                        raise ValueError(
-                            f"frame {frame_num}: subtitle line too wide ({text_width}px) > max ({max_width}px): {line_text}"
-                        )
-
-                    first_char_index, first_glyph, first_width = glyph_items[0]
-                    first_x = int((out.width * 0.05) + max_width - ((max_width - text_width) / 2) - first_width)
-                    line_y = base_y + line_index * line_height
-                    print(
-                        f"frame {frame_num}: line {line_index} first char index={first_char_index}, "
-                        f"text width={text_width}px, max width={max_width}px, first x={first_x}, y={line_y}"
-                    )
-
-                    # Draw first letter at computed x, then continue right-to-left.
-                    draw_glyph(
-                        out,
-                        first_glyph,
-                        x_position=first_x,
-                        y_position=line_y,
-                        color_index=paint_color_index,
-                    )
-
-                    cursor_x = first_x
-                    for char_index, glyph, glyph_width in glyph_items[1:]:
-                        cursor_x -= glyph_width
-                        draw_glyph(
-                            out,
-                            glyph,
-                            x_position=cursor_x,
-                            y_position=line_y,
-                            color_index=paint_color_index,
-                        )
-
-            out_path = output_dir / src.name
-            out.save(out_path)
-
-    # Frames before first marker: no subtitle.
-    first_marker_frame = markers[0][0]
-    for f in range(start_print, min(first_marker_frame, timeline_end + 1)):
-        #print(f"frame {f}: inject ")
-        process_frame(f, "")
+    # The paint colour comes from the first frame's palette, once.
+    with Image.open(jobs[0][1]) as img:
+        paint_color_index = detect_paint_color_index(img, jobs[0][0])
 
-    # Marker spans.
-    for i, (start, text, _line_no) in enumerate(markers):
-        if i + 1 < len(markers):
-            end = markers[i + 1][0] - 1
+    # One task per run of frames sharing a subtitle (split into batches of
+    # at most SPAN_BATCH), so each worker renders a line's mask once.
+    tasks = []
+    for frame_job in jobs:
+        last = tasks[-1][0] if tasks else None
+        if last and last[-1][3] == frame_job[3] and len(last) < SPAN_BATCH:
+            last.append(frame_job)
         else:
-            end = timeline_end
-
-        if end < start:
-            continue
-
-        span_start = max(start, start_print)
-        span_end = min(end, timeline_end)
-        if span_end < span_start:
-            continue
-
-        for f in range(span_start, span_end + 1):
-            #print(f"frame {f}: inject {text}")
-            process_frame(f, text)
+            tasks.append(([frame_job], str(font_path), args.y_position, paint_color_index))
+
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(workers, len(tasks)))
+    if workers == 1:
+        results = map(process_frames, tasks)
+        for log in results:
+            for line in log:
+                print(line)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for log in pool.imap(process_frames, tasks):
+                for line in log:
+                    print(line)
 
 
 if __name__ == "__main__":
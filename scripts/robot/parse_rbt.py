@@ -18,6 +18,18 @@ Options:
     --audio                     Extract audio as WAV (audio.wav in output dir)
     --canvas-width  W           Override output canvas width  (default: auto)
     --canvas-height H           Override output canvas height (default: auto)
+    -j / --jobs N               Extract frames in N worker processes
+                                (default: 1; 0 = one per CPU)
+    --list                      List every frame (offset, sizes, audio position,
+                                cel rectangles) instead of extracting
+    --no-index                  Neither read nor write the sidecar index
+
+Index:
+    <file.rbt>.index.json       Header, size tables, frame offsets, cel
+                                rectangles and audio positions, reused by the
+                                next open while the file's size, mtime and
+                                header bytes are unchanged (skipped if it
+                                cannot be written)
 
 Output:
     frame_NNNNN.png             One PNG per frame (requires Pillow)
@@ -32,6 +44,13 @@ import struct
 import sys
 import os
 import argparse
+import array
+import itertools
+import mmap
+import multiprocessing
+import json
+import base64
+import hashlib
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -39,62 +58,116 @@ import argparse
 # (engines/sci/resource/decompressor.cpp)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Optional compiled backend: an importable `lzs_native` module exposing
+# decompress(data: bytes, unpacked_size: int) -> bytes (the same module name
+# encode_rbt.py looks for an LZS compressor in).
+try:
+    import lzs_native as _lzs_native
+except ImportError:
+    _lzs_native = None
+_native_decompress = getattr(_lzs_native, 'decompress', None)
+
+
 class LZSDecompressor:
-    """MSB-first bitstream LZS / STACpack decompressor used in SCI32."""
+    """
+    MSB-first bitstream LZS / STACpack decompressor used in SCI32.
+
+    The bit reader is inlined into one loop over a 32-bit reservoir;
+    back-references are copied with slice assignments, and overlapping
+    ones (offset < length, i.e. runs) are expanded by repeatedly doubling
+    the part already copied.  Output goes straight into a preallocated
+    buffer.  An installed `lzs_native.decompress` is used when present.
+    """
 
     def __init__(self, data: bytes):
-        self._data   = data
-        self._pos    = 0
-        self._bitbuf = 0   # up to 32 bits cached (MSB-justified)
-        self._nbits  = 0
-
-    def _fetch(self):
-        while self._nbits <= 24 and self._pos < len(self._data):
-            byte = self._data[self._pos]; self._pos += 1
-            self._bitbuf = (self._bitbuf | (byte << (24 - self._nbits))) & 0xFFFFFFFF
-            self._nbits += 8
-
-    def _get(self, n: int) -> int:
-        if self._nbits < n:
-            self._fetch()
-        ret = (self._bitbuf >> (32 - n)) & ((1 << n) - 1)
-        self._bitbuf = (self._bitbuf << n) & 0xFFFFFFFF
-        self._nbits -= n
-        return ret
-
-    def _comp_len(self) -> int:
-        """Variable-length match-length field."""
-        b = self._get(2)
-        if b < 3:
-            return b + 2          # 0→2, 1→3, 2→4
-        b = self._get(2)
-        if b < 3:
-            return b + 5          # 0→5, 1→6, 2→7
-        clen = 8
-        while True:
-            nibble = self._get(4)
-            clen += nibble
-            if nibble != 0xF:
-                break
-        return clen
+        self._data = data
 
     def decompress(self, unpacked_size: int) -> bytes:
-        out = bytearray()
-        while len(out) < unpacked_size:
-            if self._get(1):                 # compressed reference
-                if self._get(1):             # 7-bit back-offset
-                    offs = self._get(7)
-                    if offs == 0:            # end-of-stream marker
-                        break
-                else:                        # 11-bit back-offset
-                    offs = self._get(11)
-                clen = self._comp_len()
-                start = len(out) - offs
-                for i in range(clen):
-                    out.append(out[start + i])
-            else:                            # literal byte
-                out.append(self._get(8))
-        return bytes(out)
+        out = bytearray(unpacked_size)
+        end = self.decompress_into(out)
+        return bytes(out) if end == unpacked_size else bytes(out[:end])
+
+    def decompress_into(self, out: bytearray, pos: int = 0, size: int = None) -> int:
+        """
+        Decode into out[pos:pos + size] (default: up to the end of `out`)
+        and return the position after the last byte written.
+        """
+        end = len(out) if size is None else pos + size
+        if _native_decompress is not None:
+            chunk = _native_decompress(bytes(self._data), end - pos)[:end - pos]
+            out[pos:pos + len(chunk)] = chunk
+            return pos + len(chunk)
+
+        data  = self._data
+        ndata = len(data)
+        dp    = 0
+        acc   = 0            # bit reservoir; the low `nb` bits are unread
+        nb    = 0
+        base  = pos
+
+        while pos < end:
+            # One token needs at most 17 bits before its length nibbles.
+            while nb <= 24:
+                acc = ((acc << 8) | (data[dp] if dp < ndata else 0)) & 0xFFFFFFFF
+                dp += 1
+                nb += 8
+
+            if not (acc >> (nb - 1)) & 1:            # literal byte
+                nb -= 9
+                out[pos] = (acc >> nb) & 0xFF
+                pos += 1
+                continue
+
+            nb -= 2
+            if (acc >> nb) & 1:                      # 7-bit back-offset
+                nb -= 7
+                offs = (acc >> nb) & 0x7F
+                if offs == 0:                        # end-of-stream marker
+                    break
+            else:                                    # 11-bit back-offset
+                nb -= 11
+                offs = (acc >> nb) & 0x7FF
+
+            # Variable-length match-length field
+            nb -= 2
+            clen = (acc >> nb) & 3
+            if clen < 3:
+                clen += 2                            # 0→2, 1→3, 2→4
+            else:
+                nb -= 2
+                clen = (acc >> nb) & 3
+                if clen < 3:
+                    clen += 5                        # 0→5, 1→6, 2→7
+                else:
+                    clen = 8
+                    while True:
+                        if nb < 4:
+                            acc = ((acc << 8) | (data[dp] if dp < ndata else 0)) & 0xFFFFFFFF
+                            dp += 1
+                            nb += 8
+                        nb -= 4
+                        nibble = (acc >> nb) & 0xF
+                        clen += nibble
+                        if nibble != 0xF:
+                            break
+
+            n   = min(clen, end - pos)
+            src = pos - offs
+            if src < base:                           # corrupt stream: no history
+                for i in range(n):
+                    out[pos + i] = out[src + i] if src + i >= base else 0
+            elif offs >= n:
+                out[pos:pos + n] = out[src:src + n]
+            else:
+                out[pos:pos + offs] = out[src:pos]
+                done = offs
+                while done < n:
+                    step = min(done, n - done)
+                    out[pos + done:pos + done + step] = out[pos:pos + step]
+                    done += step
+            pos += n
+
+        return pos
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -132,6 +205,17 @@ def deDPCM16(data: bytes) -> bytes:
     return pcm
 
 
+# Signed step for every DPCM byte: bit 7 = subtract, bits 0-6 = table index.
+_DPCM16_DELTAS = ([_DPCM16_TABLE[i] for i in range(128)] +
+                  [-_DPCM16_TABLE[i] for i in range(128)])
+
+try:
+    import numpy as _np
+    _DPCM16_DELTAS_NP = _np.array(_DPCM16_DELTAS, dtype=_np.int64)
+except ImportError:
+    _np = None
+
+
 def deDPCM16_carry(data: bytes, initial_sample: int = 0):
     """
     Like deDPCM16 but accepts an initial carry state and returns
@@ -144,21 +228,26 @@ def deDPCM16_carry(data: bytes, initial_sample: int = 0):
 
         _, carry = deDPCM16_carry(raw[:8], 0)   # warm up from runway
         pcm, _  = deDPCM16_carry(raw[8:], carry) # decode body
+
+    x86 16-bit wrap-around after every step is the same as one running sum
+    taken modulo 2**16, so the whole block is a table lookup plus a prefix
+    sum (vectorised with NumPy when it is installed).
     """
-    sample = initial_sample
-    out = bytearray()
-    for delta in data:
-        if delta & 0x80:
-            sample -= _DPCM16_TABLE[delta & 0x7F]
-        else:
-            sample += _DPCM16_TABLE[delta]
-        # emulate x86 16-bit wrap-around
-        if sample > 32767:
-            sample -= 65536
-        elif sample < -32768:
-            sample += 65536
-        out += struct.pack('<h', sample)
-    return bytes(out), sample
+    if not data:
+        return b'', initial_sample
+
+    if _np is not None:
+        steps = _DPCM16_DELTAS_NP[_np.frombuffer(data, dtype=_np.uint8)]
+        pcm   = (_np.cumsum(steps) + initial_sample).astype('<i2')
+        return pcm.tobytes(), int(pcm[-1])
+
+    pcm = array.array('h', [((s + 32768) & 0xFFFF) - 32768 for s in
+                            itertools.accumulate(map(_DPCM16_DELTAS.__getitem__, data),
+                                                 initial=initial_sample)][1:])
+    carry = pcm[-1]
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes(), int(carry)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -230,13 +319,15 @@ def parse_hunk_palette(data: bytes):
 # (engines/sci/video/robot_decoder.cpp)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def expand_cel(source: bytes, cel_width: int, cel_height: int, v_scale: int) -> bytes:
+def expand_cel(source, cel_width: int, cel_height: int, v_scale: int):
     """
     Reconstruct a cel that had lines deleted during compression.
     v_scale is the percentage of lines kept (100 = no decimation).
 
     The algorithm is a Bresenham-style distributor that replicates source rows;
-    replicating the last rows more than the first ones.
+    replicating the last rows more than the first ones.  Returns a new
+    bytearray of cel_width × cel_height bytes (or `source` itself when there
+    is nothing to expand).
     """
     if v_scale == 100:
         return source
@@ -261,13 +352,17 @@ def expand_cel(source: bytes, cel_width: int, cel_height: int, v_scale: int) ->
         remainder %= denominator
         lines_per_row.append(n)
 
-    out = bytearray()
+    out = bytearray(cel_width * sum(lines_per_row))
+    src = memoryview(source)
+    dst = 0
     for i in range(source_height):
-        row = source[i * cel_width: (i + 1) * cel_width]
+        row = src[i * cel_width: (i + 1) * cel_width]
         for _ in range(lines_per_row[i]):
-            out += row
-
-    return bytes(out)
+            out[dst:dst + len(row)] = row
+            dst += len(row)
+    if dst != len(out):      # short source: drop what it could not fill
+        del out[dst:]
+    return out
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -295,7 +390,7 @@ class RBTCel:
         self.height  = 0
         self.x       = 0
         self.y       = 0
-        self.pixels  = b''   # raw 8-bit indexed, width × height bytes, top-to-bottom
+        self.pixels  = b''   # raw 8-bit indexed, width × height bytes (a bytearray once decoded), top-to-bottom
 
 
 class RBTFrame:
@@ -328,234 +423,551 @@ def make_readers(big_endian: bool):
     return u16, s16, u32, s32
 
 
+def iter_cels(vid, readers):
+    """
+    Walk the cel and chunk headers of one frame's video data `vid`.
+
+    Yields (cel, chunks) per cel: an RBTCel with its header fields filled
+    in (pixels left empty) and a list of (comp_type, decomp_size, data),
+    where data is a slice of `vid` – a view when `vid` is a memoryview.
+    Stops at the first header that runs past the end of `vid`.
+    """
+    u16, s16, u32, s32 = readers
+    if len(vid) < 2:
+        return
+    num_cels = u16(vid, 0)[0]
+    vp = 2
+
+    for _ in range(num_cels):
+        if vp + 22 > len(vid):
+            return
+
+        cel = RBTCel()
+        cel.v_scale   = vid[vp + 1]
+        cel.width,  _ = u16(vid, vp + 2)
+        cel.height, _ = u16(vid, vp + 4)
+        # x/y are signed int16 in Robot coordinates
+        cel.x,      _ = s16(vid, vp + 10)
+        cel.y,      _ = s16(vid, vp + 12)
+        num_chunks, _ = u16(vid, vp + 16)
+        vp += 22    # skip cel header (kCelHeaderSize = 22)
+
+        chunks = []
+        for _ in range(num_chunks):
+            if vp + 10 > len(vid):
+                break
+            comp_size,   _ = u32(vid, vp)
+            decomp_size, _ = u32(vid, vp + 4)
+            comp_type,   _ = u16(vid, vp + 8)
+            vp += 10
+            chunks.append((comp_type, decomp_size, vid[vp: vp + comp_size]))
+            vp += comp_size
+        yield cel, chunks
+
+
 # ─────────────────────────────────────────────────────────────────────────────
-# Main parser
+# Random-access reader
 # ─────────────────────────────────────────────────────────────────────────────
 
-def parse_rbt(filepath: str, verbose: bool = True):
+class RobotFile:
     """
-    Parse an RBT file.
-
-    Returns:
-        hdr           – RBTHeader
-        palette       – list of 256 (R,G,B) tuples, or None
-        frames        – list of RBTFrame (cels fully decoded to 8-bit indexed pixels)
-        record_pos    – list of byte offsets, one per frame
-        cue_times     – list of 256 tick values
-        cue_values    – list of 256 cue values
+    Lazy, random-access Robot file reader.
+
+    Opening a file parses only the header, palette, size tables, cue tables
+    and the frame offset index (`record_pos`); the file itself is memory-
+    mapped and each frame is decoded when it is asked for:
+
+        with RobotFile('91.RBT') as rbt:
+            frame = rbt[100]            # decode one frame
+            for frame in rbt[100:111]:  # or a range
+                ...
+            audio = rbt.read_frame(5, video=False)   # audio packet only
+
+    Attributes mirror parse_rbt()'s results: hdr, palette, record_pos,
+    cue_times, cue_values, plus video_sizes / packet_sizes, the raw palette
+    and primer bytes (raw_palette, raw_primer) and big_endian.  cel_rects
+    (per frame, a list of (x, y, width, height, v_scale)) and
+    audio_positions describe every frame without decoding it.
+
+    All of this is saved in a small sidecar index next to the file
+    (<file>.index.json) and read back on the next open instead of walking
+    the file, as long as the file's size, mtime and the SHA-1 of
+    everything in front of the first frame still match.  Pass
+    use_index=False to always parse the file itself; if the index cannot
+    be written (read-only directory) it is simply skipped.
     """
-    with open(filepath, 'rb') as f:
-        data = f.read()
-
-    # ── Signature check ──────────────────────────────────────────────────────
-    if data[0] != 0x16:
-        raise ValueError(f"Not a Robot file: byte 0 = 0x{data[0]:02X}, expected 0x16")
-    if data[2:6] != b'SOL\x00':
-        raise ValueError(f"Not a Robot file: magic bytes {data[2:6]!r}, expected b'SOL\\x00'")
-
-    # ── Endianness detection ─────────────────────────────────────────────────
-    # Most files are little-endian (x86 DOS/Windows).
-    # 68k/PPC Mac files are big-endian; ScummVM detects by checking whether
-    # reading the version field as big-endian gives a value in [1, 255].
-    ver_be = struct.unpack_from('>H', data, 6)[0]
-    big_endian = (0 < ver_be <= 0x00FF)
-
-    u16, s16, u32, s32 = make_readers(big_endian)
-
-    # ── File header (starts at offset 6 after the 6-byte preamble) ──────────
-    pos = 6
-    hdr = RBTHeader()
-
-    hdr.version,             pos = u16(data, pos)
-    hdr.audio_block_size,    pos = u16(data, pos)
-    hdr.primer_zero_compress,pos = s16(data, pos)
-    pos += 2                                         # unused
-    hdr.num_frames,          pos = u16(data, pos)
-    palette_size,            pos = u16(data, pos)
-    hdr.palette_size         = palette_size
-    hdr.primer_reserved_size,pos = u16(data, pos)
-    hdr.x_res,               pos = s16(data, pos)
-    hdr.y_res,               pos = s16(data, pos)
-    hdr.has_palette          = bool(data[pos]); pos += 1
-    hdr.has_audio            = bool(data[pos]); pos += 1
-    pos += 2                                         # unused
-    hdr.frame_rate,          pos = s16(data, pos)
-    hdr.is_hi_res,           pos = s16(data, pos)
-    hdr.max_skippable,       pos = s16(data, pos)
-    hdr.max_cels,            pos = s16(data, pos)
-    hdr.max_cel_area         = []
-    for _ in range(4):
-        v, pos = s32(data, pos)
-        hdr.max_cel_area.append(v)
-    pos += 8                                         # reserved
-
-    if verbose:
-        print(f"=== Robot file: {os.path.basename(filepath)} ===")
-        print(f"  Version:        v{hdr.version}  ({'big' if big_endian else 'little'}-endian)")
+
+    INDEX_SUFFIX = '.index.json'
+    INDEX_FORMAT = 1   # bump whenever the index layout changes
+
+    def __init__(self, filepath: str, verbose: bool = False, use_index: bool = True):
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                  # empty file: cannot be mapped
+            self.data = b''
+        # Frame data is sliced through this view, so cel chunks reach the
+        # decompressor without being copied out of the mapping.
+        self._view = memoryview(self.data)
+        try:
+            if not (use_index and self._load_index()):
+                self._parse_index()
+                self._scan_frames()
+                if use_index:
+                    self._save_index()
+            if verbose:
+                self._print_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_index(self):
+        data = self.data
+
+        # ── Signature check ──────────────────────────────────────────────────
+        if len(data) < 60 or data[0] != 0x16:
+            raise ValueError(f"Not a Robot file: byte 0 = 0x{data[0] if data else 0:02X}, "
+                             f"expected 0x16")
+        if data[2:6] != b'SOL\x00':
+            raise ValueError(f"Not a Robot file: magic bytes {data[2:6]!r}, expected b'SOL\\x00'")
+
+        # ── Endianness detection ─────────────────────────────────────────────
+        # Most files are little-endian (x86 DOS/Windows).
+        # 68k/PPC Mac files are big-endian; ScummVM detects by checking whether
+        # reading the version field as big-endian gives a value in [1, 255].
+        ver_be = struct.unpack_from('>H', data, 6)[0]
+        big_endian = (0 < ver_be <= 0x00FF)
+        self.big_endian = big_endian
+
+        u16, s16, u32, s32 = make_readers(big_endian)
+        self._readers = (u16, s16, u32, s32)
+
+        # ── File header (starts at offset 6 after the 6-byte preamble) ──────
+        pos = 6
+        hdr = RBTHeader()
+
+        hdr.version,             pos = u16(data, pos)
+        hdr.audio_block_size,    pos = u16(data, pos)
+        hdr.primer_zero_compress,pos = s16(data, pos)
+        pos += 2                                         # unused
+        hdr.num_frames,          pos = u16(data, pos)
+        palette_size,            pos = u16(data, pos)
+        hdr.palette_size         = palette_size
+        hdr.primer_reserved_size,pos = u16(data, pos)
+        hdr.x_res,               pos = s16(data, pos)
+        hdr.y_res,               pos = s16(data, pos)
+        hdr.has_palette          = bool(data[pos]); pos += 1
+        hdr.has_audio            = bool(data[pos]); pos += 1
+        pos += 2                                         # unused
+        hdr.frame_rate,          pos = s16(data, pos)
+        hdr.is_hi_res,           pos = s16(data, pos)
+        hdr.max_skippable,       pos = s16(data, pos)
+        hdr.max_cels,            pos = s16(data, pos)
+        hdr.max_cel_area         = []
+        for _ in range(4):
+            v, pos = s32(data, pos)
+            hdr.max_cel_area.append(v)
+        pos += 8                                         # reserved
+        self.hdr = hdr
+
+        if hdr.version not in (5, 6):
+            raise ValueError(f"Unsupported Robot version {hdr.version} (only v5 and v6 are supported)")
+
+        # ── Audio primer section ─────────────────────────────────────────────
+        even_primer_size = 0
+        odd_primer_size  = 0
+        primer_header_pos = pos
+
+        if hdr.has_audio:
+            if hdr.primer_reserved_size != 0:
+                total_primer_size,  pos = s32(data, pos)
+                compression_type,   pos = s16(data, pos)
+                even_primer_size,   pos = s32(data, pos)
+                odd_primer_size,    pos = s32(data, pos)
+                if compression_type != 0:
+                    print(f"  WARNING: unknown primer compression type {compression_type}")
+                if even_primer_size + odd_primer_size != hdr.primer_reserved_size:
+                    pos = primer_header_pos + hdr.primer_reserved_size
+                else:
+                    pos += even_primer_size + odd_primer_size
+            elif hdr.primer_zero_compress:
+                even_primer_size = 19922
+                odd_primer_size  = 21024
+                # Zero-filled buffers – no bytes in file
+            else:
+                raise ValueError("Robot audio primer flags are inconsistent")
+        else:
+            pos += hdr.primer_reserved_size
+        self.raw_primer = data[primer_header_pos:pos]
+
+        # ── Embedded palette ─────────────────────────────────────────────────
+        self.raw_palette = data[pos: pos + palette_size]
+        palette = None
+        if hdr.has_palette and palette_size > 0:
+            palette = parse_hunk_palette(self.raw_palette)
+        pos += palette_size
+        self.palette = palette
+
+        # ── Video frame size and packet size (video + audio) indexes ─────────
+        n = hdr.num_frames
+        fmt = ('>' if big_endian else '<') + ('H' if hdr.version == 5 else 'i') * n
+        entry = 2 if hdr.version == 5 else 4
+        self.video_sizes  = list(struct.unpack_from(fmt, data, pos)); pos += n * entry
+        self.packet_sizes = list(struct.unpack_from(fmt, data, pos)); pos += n * entry
+
+        # ── Cue times (256 × int32) and cue values (256 × uint16) ────────────
+        self.cue_times  = [s32(data, pos + i*4)[0] for i in range(256)]
+        pos += 256 * 4
+        self.cue_values = [u16(data, pos + i*2)[0] for i in range(256)]
+        pos += 256 * 2
+
+        # ── Align to next 2048-byte sector ───────────────────────────────────
+        rem = pos % 2048
+        if rem:
+            pos += 2048 - rem
+
+        # ── Build frame offset table ─────────────────────────────────────────
+        record_pos = [pos]
+        for i in range(n - 1):
+            pos += self.packet_sizes[i]
+            record_pos.append(pos)
+        self.record_pos = record_pos
+
+    def _scan_frames(self):
+        """Read every frame's cel headers and audio position (no decoding)."""
+        s32  = self._readers[3]
+        data = self._view
+        self.cel_rects       = []
+        self.audio_positions = []
+        for fp, vlen in zip(self.record_pos, self.video_sizes):
+            rects = [(cel.x, cel.y, cel.width, cel.height, cel.v_scale)
+                     for cel, _chunks in iter_cels(data[fp: fp + vlen], self._readers)]
+            self.cel_rects.append(rects)
+
+            ap = fp + vlen
+            if self.hdr.has_audio and ap + 8 <= len(data):
+                self.audio_positions.append(s32(data, ap)[0])
+            else:
+                self.audio_positions.append(0)
+
+    def _print_header(self):
+        hdr = self.hdr
+        print(f"=== Robot file: {os.path.basename(self.filepath)} ===")
+        print(f"  Version:        v{hdr.version}  ({'big' if self.big_endian else 'little'}-endian)")
         print(f"  Frames:         {hdr.num_frames}")
         print(f"  Frame rate:     {hdr.frame_rate} fps")
         print(f"  Resolution:     {hdr.x_res}x{hdr.y_res}")
-        print(f"  Has palette:    {hdr.has_palette}  ({palette_size} bytes)")
+        print(f"  Has palette:    {hdr.has_palette}  ({hdr.palette_size} bytes)")
         print(f"  Has audio:      {hdr.has_audio}    (block size {hdr.audio_block_size} bytes)")
         print(f"  Max cels/frame: {hdr.max_cels}")
-
-    if hdr.version not in (5, 6):
-        raise ValueError(f"Unsupported Robot version {hdr.version} (only v5 and v6 are supported)")
-
-    # ── Audio primer section ─────────────────────────────────────────────────
-    even_primer_size = 0
-    odd_primer_size  = 0
-    primer_header_pos = pos
-
-    if hdr.has_audio:
-        if hdr.primer_reserved_size != 0:
-            total_primer_size,  pos = s32(data, pos)
-            compression_type,   pos = s16(data, pos)
-            even_primer_size,   pos = s32(data, pos)
-            odd_primer_size,    pos = s32(data, pos)
-            if compression_type != 0:
-                print(f"  WARNING: unknown primer compression type {compression_type}")
-            if even_primer_size + odd_primer_size != hdr.primer_reserved_size:
-                pos = primer_header_pos + hdr.primer_reserved_size
-            else:
-                pos += even_primer_size + odd_primer_size
-        elif hdr.primer_zero_compress:
-            even_primer_size = 19922
-            odd_primer_size  = 21024
-            # Zero-filled buffers – no bytes in file
-        else:
-            raise ValueError("Robot audio primer flags are inconsistent")
-    else:
-        pos += hdr.primer_reserved_size
-
-    # ── Embedded palette ─────────────────────────────────────────────────────
-    palette = None
-    if hdr.has_palette and palette_size > 0:
-        raw_pal = data[pos: pos + palette_size]
-        palette = parse_hunk_palette(raw_pal)
-    pos += palette_size
-
-    if verbose and palette:
-        print(f"  Palette:        loaded ({len(palette)} entries)")
-
-    # ── Video frame size index ───────────────────────────────────────────────
-    video_sizes = []
-    if hdr.version == 5:
-        for _ in range(hdr.num_frames):
-            v, pos = u16(data, pos); video_sizes.append(v)
-    else:  # v6
-        for _ in range(hdr.num_frames):
-            v, pos = s32(data, pos); video_sizes.append(v)
-
-    # ── Packet size index (video + audio per frame) ──────────────────────────
-    packet_sizes = []
-    if hdr.version == 5:
-        for _ in range(hdr.num_frames):
-            v, pos = u16(data, pos); packet_sizes.append(v)
-    else:  # v6
-        for _ in range(hdr.num_frames):
-            v, pos = s32(data, pos); packet_sizes.append(v)
-
-    # ── Cue times (256 × int32) ──────────────────────────────────────────────
-    cue_times  = [s32(data, pos + i*4)[0] for i in range(256)]
-    pos += 256 * 4
-
-    # ── Cue values (256 × uint16) ────────────────────────────────────────────
-    cue_values = [u16(data, pos + i*2)[0] for i in range(256)]
-    pos += 256 * 2
-
-    # ── Align to next 2048-byte sector ───────────────────────────────────────
-    rem = pos % 2048
-    if rem:
-        pos += 2048 - rem
-
-    # ── Build frame offset table ─────────────────────────────────────────────
-    record_pos = [pos]
-    for i in range(hdr.num_frames - 1):
-        pos += packet_sizes[i]
-        record_pos.append(pos)
-
-    if verbose:
-        print(f"  First frame at: 0x{record_pos[0]:08X}")
-        print(f"  File size:      {len(data)} bytes")
-
-    # ── Decode frames ────────────────────────────────────────────────────────
-    frames = []
-    for frame_no in range(hdr.num_frames):
-        fp   = record_pos[frame_no]
-        vlen = video_sizes[frame_no]
-        vid  = data[fp: fp + vlen]
+        if self.palette:
+            print(f"  Palette:        loaded ({len(self.palette)} entries)")
+        if self.record_pos:
+            print(f"  First frame at: 0x{self.record_pos[0]:08X}")
+        print(f"  File size:      {len(self.data)} bytes")
+
+    # ── Sidecar index ────────────────────────────────────────────────────────
+
+    @property
+    def index_path(self) -> str:
+        return self.filepath + self.INDEX_SUFFIX
+
+    def _file_stamp(self):
+        st = os.fstat(self._file.fileno())
+        return st.st_size, st.st_mtime_ns
+
+    def _prelude_sha1(self, record_pos) -> str:
+        """SHA-1 of everything in front of the first frame: header, primer, palette and tables."""
+        return hashlib.sha1(self._view[:record_pos[0] if record_pos else len(self.data)]).hexdigest()
+
+    def _load_index(self) -> bool:
+        """Fill in everything _parse_index/_scan_frames would from the sidecar; False on a miss."""
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                idx = json.load(f)
+            size, mtime_ns = self._file_stamp()
+            if (idx.get('format') != self.INDEX_FORMAT or idx['size'] != size
+                    or idx['mtime_ns'] != mtime_ns):
+                return False
+            if idx['sha1'] != self._prelude_sha1(idx['record_pos']):
+                return False       # another file with the same size and mtime
+
+            hdr = RBTHeader()
+            for name in RBTHeader.__slots__:
+                setattr(hdr, name, idx['header'][name])
+            self.hdr             = hdr
+            self.big_endian      = idx['big_endian']
+            self._readers        = make_readers(self.big_endian)
+            self.raw_primer      = base64.b64decode(idx['raw_primer'])
+            self.raw_palette     = base64.b64decode(idx['raw_palette'])
+            self.video_sizes     = idx['video_sizes']
+            self.packet_sizes    = idx['packet_sizes']
+            self.cue_times       = idx['cue_times']
+            self.cue_values      = idx['cue_values']
+            self.record_pos      = idx['record_pos']
+            self.cel_rects       = [[tuple(r) for r in rects] for rects in idx['cel_rects']]
+            self.audio_positions = idx['audio_positions']
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self.palette = None
+        if hdr.has_palette and hdr.palette_size > 0:
+            self.palette = parse_hunk_palette(self.raw_palette)
+        return True
+
+    def _save_index(self):
+        """Write the sidecar index; silently skipped if it cannot be written."""
+        size, mtime_ns = self._file_stamp()
+        idx = {
+            'format':          self.INDEX_FORMAT,
+            'size':            size,
+            'mtime_ns':        mtime_ns,
+            # Identifies the header/tables the index was built from
+            'sha1':            self._prelude_sha1(self.record_pos),
+            'header':          {name: getattr(self.hdr, name) for name in RBTHeader.__slots__},
+            'big_endian':      self.big_endian,
+            'raw_primer':      base64.b64encode(self.raw_primer).decode('ascii'),
+            'raw_palette':     base64.b64encode(self.raw_palette).decode('ascii'),
+            'video_sizes':     self.video_sizes,
+            'packet_sizes':    self.packet_sizes,
+            'cue_times':       self.cue_times,
+            'cue_values':      self.cue_values,
+            'record_pos':      self.record_pos,
+            'cel_rects':       self.cel_rects,
+            'audio_positions': self.audio_positions,
+        }
+        tmp = f'{self.index_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(idx, f, separators=(',', ':'))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    # ── Frame access ─────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return self.hdr.num_frames
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.read_frame(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"frame {index} out of range (0-{len(self) - 1})")
+        return self.read_frame(index)
+
+    def __iter__(self):
+        for frame_no in range(len(self)):
+            yield self.read_frame(frame_no)
+
+    def iter_audio(self):
+        """Yield every frame with its audio packet only (no video decoding)."""
+        for frame_no in range(len(self)):
+            yield self.read_frame(frame_no, video=False)
+
+    def read_frame(self, frame_no: int, video: bool = True, audio: bool = True) -> RBTFrame:
+        """Decode frame `frame_no`; `video`/`audio` select which parts to read."""
+        data  = self.data
+        fp    = self.record_pos[frame_no]
+        vlen  = self.video_sizes[frame_no]
         frame = RBTFrame(frame_no)
 
-        if len(vid) >= 2:
-            num_cels = u16(vid, 0)[0]
-            vp = 2
-
-            for _ in range(num_cels):
-                if vp + 22 > len(vid):
-                    break
-
-                cel = RBTCel()
-                cel.v_scale   = vid[vp + 1]
-                cel.width,  _ = u16(vid, vp + 2)
-                cel.height, _ = u16(vid, vp + 4)
-                # x/y are signed int16 in Robot coordinates
-                cel.x = struct.unpack_from('>h' if big_endian else '<h', vid, vp + 10)[0]
-                cel.y = struct.unpack_from('>h' if big_endian else '<h', vid, vp + 12)[0]
-                data_size,  _ = u16(vid, vp + 14)
-                num_chunks, _ = u16(vid, vp + 16)
-                vp += 22    # skip cel header (kCelHeaderSize = 22)
-
-                pixels = bytearray()
-                for _ in range(num_chunks):
-                    if vp + 10 > len(vid):
-                        break
-                    comp_size,   _ = u32(vid, vp)
-                    decomp_size, _ = u32(vid, vp + 4)
-                    comp_type,   _ = u16(vid, vp + 8)
-                    vp += 10
-
-                    chunk = vid[vp: vp + comp_size]
-                    vp += comp_size
-
-                    if comp_type == 0:        # LZS
-                        pixels += LZSDecompressor(chunk).decompress(decomp_size)
-                    elif comp_type == 2:      # uncompressed
-                        pixels += chunk[:decomp_size]
-                    else:
-                        print(f"  WARNING frame {frame_no}: unknown chunk compression {comp_type}")
-                        pixels += bytes(decomp_size)
-
-                if cel.v_scale != 100 and pixels:
-                    pixels = expand_cel(bytes(pixels), cel.width, cel.height, cel.v_scale)
-
-                cel.pixels = bytes(pixels)
-                frame.cels.append(cel)
+        if video:
+            self._decode_video(frame, self._view[fp: fp + vlen])
 
         # Audio packet immediately follows video data
-        if hdr.has_audio:
+        if audio and self.hdr.has_audio:
             ap = fp + vlen
             if ap + 8 <= len(data):
-                abs_pos = struct.unpack_from('<i' if not big_endian else '>i', data, ap)[0]
-                blk_size= struct.unpack_from('<i' if not big_endian else '>i', data, ap + 4)[0]
+                abs_pos, blk_size = struct.unpack_from('>ii' if self.big_endian else '<ii', data, ap)
                 frame.audio_position = abs_pos
                 frame.audio_size     = blk_size
                 # The audio block includes an 8-byte DPCM runway that is discarded.
                 # We store the whole block (runway + compressed data) for completeness.
                 frame.audio_raw = data[ap + 8: ap + 8 + blk_size]
 
-        frames.append(frame)
+        return frame
+
+    def cel_chunks(self, frame_no: int):
+        """
+        Yield iter_cels()'s (cel, chunks) for frame `frame_no` without
+        decoding anything.  The chunk data are views into the mapped file:
+        copy what must outlive the iteration or the file.
+        """
+        fp = self.record_pos[frame_no]
+        return iter_cels(self._view[fp: fp + self.video_sizes[frame_no]], self._readers)
+
+    def _decode_video(self, frame: RBTFrame, vid: memoryview):
+        """
+        Decode the cels of one frame from `vid`, a view into the mapped file.
+        Each cel's chunks are decompressed (or copied) straight into one
+        preallocated buffer that becomes cel.pixels.
+        """
+        for cel, chunks in iter_cels(vid, self._readers):
+            # Stored rows: fewer than cel.height when the cel is v-scaled
+            rows = cel.height
+            if cel.v_scale != 100 and (cel.height * cel.v_scale) // 100 > 0:
+                rows = (cel.height * cel.v_scale) // 100
+            pixels = bytearray(cel.width * rows)
+            pos = 0
+            for comp_type, decomp_size, chunk in chunks:
+                if pos + decomp_size > len(pixels):      # more data than the header says
+                    pixels += bytes(pos + decomp_size - len(pixels))
+                if comp_type == 0:        # LZS
+                    pos = LZSDecompressor(chunk).decompress_into(pixels, pos, decomp_size)
+                elif comp_type == 2:      # uncompressed
+                    n = min(decomp_size, len(chunk))
+                    pixels[pos:pos + n] = chunk[:n]
+                    pos += n
+                else:
+                    print(f"  WARNING frame {frame.frame_no}: unknown chunk compression {comp_type}")
+                    pos += decomp_size
+            if pos != len(pixels):
+                del pixels[pos:]
+
+            if cel.v_scale != 100 and pixels:
+                pixels = expand_cel(pixels, cel.width, cel.height, cel.v_scale)
+
+            cel.pixels = pixels
+            frame.cels.append(cel)
+
+    # ── Lifetime ─────────────────────────────────────────────────────────────
+
+    def close(self):
+        self._view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
-    return hdr, palette, frames, record_pos, cue_times, cue_values
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Main parser
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_rbt(filepath: str, verbose: bool = True):
+    """
+    Parse an RBT file and decode every frame (see RobotFile for lazy access).
+
+    Returns:
+        hdr           – RBTHeader
+        palette       – list of 256 (R,G,B) tuples, or None
+        frames        – list of RBTFrame (cels fully decoded to 8-bit indexed pixels)
+        record_pos    – list of byte offsets, one per frame
+        cue_times     – list of 256 tick values
+        cue_values    – list of 256 cue values
+    """
+    with RobotFile(filepath, verbose) as rbt:
+        frames = list(rbt)
+        return rbt.hdr, rbt.palette, frames, rbt.record_pos, rbt.cue_times, rbt.cue_values
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Output helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+class FrameCompositor:
+    """
+    Composites the cels of a frame onto one reusable 8-bit canvas.
+
+    Each cel is blitted row-block by slicing and clipped to the canvas on
+    all four sides (negative x/y included).  rgb() then maps the whole
+    canvas through the palette with a single lookup-table gather.  The
+    canvas and RGB buffers are allocated once and overwritten by every
+    call, so copy the results if they must outlive the next frame.
+
+    Uses NumPy when available; otherwise a bytearray canvas and Pillow
+    for the RGB conversion.
+    """
+
+    def __init__(self, canvas_w: int, canvas_h: int, palette=None):
+        self.canvas_w = canvas_w
+        self.canvas_h = canvas_h
+        if palette:
+            colors = [tuple(c) for c in palette[:256]]
+        else:
+            colors = [(v, v, v) for v in range(256)]     # greyscale fallback
+        colors += [(0, 0, 0)] * (256 - len(colors))
+        self.flat_palette = [v for c in colors for v in c]
+
+        if _np is not None:
+            self.canvas = _np.zeros((canvas_h, canvas_w), dtype=_np.uint8)
+            self._lut   = _np.array(colors, dtype=_np.uint8)
+            self._rgb   = _np.empty((canvas_h, canvas_w, 3), dtype=_np.uint8)
+        else:
+            self.canvas = bytearray(canvas_w * canvas_h)
+
+    def compose(self, frame: RBTFrame):
+        """Composite `frame` and return the indexed canvas (reused buffer)."""
+        cw, ch = self.canvas_w, self.canvas_h
+        canvas = self.canvas
+        if _np is not None:
+            canvas.fill(0)
+        else:
+            canvas[:] = bytes(len(canvas))
+
+        for cel in frame.cels:
+            w, h = cel.width, cel.height
+            if not cel.pixels or w <= 0 or h <= 0:
+                continue
+            x0, y0 = max(0, cel.x), max(0, cel.y)
+            x1, y1 = min(cw, cel.x + w), min(ch, cel.y + h)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            needed = w * h
+            pix = cel.pixels
+            if len(pix) != needed:
+                pix = pix[:needed].ljust(needed, b'\x00')
+            sx, sy = x0 - cel.x, y0 - cel.y
+            if _np is not None:
+                src = _np.frombuffer(pix, dtype=_np.uint8).reshape(h, w)
+                canvas[y0:y1, x0:x1] = src[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+            else:
+                span = x1 - x0
+                for row in range(y1 - y0):
+                    s0 = (sy + row) * w + sx
+                    d0 = (y0 + row) * cw + x0
+                    canvas[d0:d0 + span] = pix[s0:s0 + span]
+        return canvas
+
+    def indexed(self, frame: RBTFrame) -> bytes:
+        """Composite `frame` and return its 8-bit indexed pixels as bytes."""
+        canvas = self.compose(frame)
+        return canvas.tobytes() if _np is not None else bytes(canvas)
+
+    def rgb(self, frame: RBTFrame):
+        """
+        Composite `frame` and return its pixels as packed RGB (a buffer of
+        canvas_w × canvas_h × 3 bytes, reused by the next call).
+        """
+        canvas = self.compose(frame)
+        if _np is not None:
+            _np.take(self._lut, canvas, axis=0, out=self._rgb)
+            return self._rgb
+        from PIL import Image
+        img = Image.frombytes('P', (self.canvas_w, self.canvas_h), bytes(canvas))
+        img.putpalette(self.flat_palette)
+        return img.convert('RGB').tobytes()
+
+
 def save_frame_png(frame: RBTFrame, palette, output_dir: str,
-                   canvas_w: int = 0, canvas_h: int = 0):
-    """Composite all cels of one frame and save as a palettised PNG."""
+                   canvas_w: int = 0, canvas_h: int = 0,
+                   compositor: FrameCompositor = None):
+    """
+    Composite all cels of one frame and save as a palettised PNG.
+    Pass a `compositor` sized canvas_w × canvas_h to reuse its canvas
+    across frames.
+    """
     try:
         from PIL import Image
     except ImportError:
@@ -571,27 +983,17 @@ def save_frame_png(frame: RBTFrame, palette, output_dir: str,
         canvas_w = max(canvas_w, 1)
         canvas_h = max(canvas_h, 1)
 
-    canvas = Image.new('P', (canvas_w, canvas_h), 0)
+    if (compositor is None or compositor.canvas_w != canvas_w
+            or compositor.canvas_h != canvas_h):
+        compositor = FrameCompositor(canvas_w, canvas_h, palette)
 
-    flat_palette = []
+    canvas = Image.frombytes('P', (canvas_w, canvas_h), compositor.indexed(frame))
     if palette:
+        flat_palette = []
         for r, g, b in palette:
             flat_palette += [r, g, b]
         canvas.putpalette(flat_palette)
 
-    for cel in frame.cels:
-        if not cel.pixels or cel.width <= 0 or cel.height <= 0:
-            continue
-        needed = cel.width * cel.height
-        pix = cel.pixels[:needed].ljust(needed, b'\x00')
-        cel_img = Image.frombytes('P', (cel.width, cel.height), pix)
-        if flat_palette:
-            cel_img.putpalette(flat_palette)
-        x = max(0, cel.x)
-        y = max(0, cel.y)
-        if x < canvas_w and y < canvas_h:
-            canvas.paste(cel_img, (x, y))
-
     out_path = os.path.join(output_dir, f'frame_{frame.frame_no:05d}.png')
     canvas.save(out_path)   # keep mode 'P' → 8-bit paletted PNG
 
@@ -606,19 +1008,24 @@ def save_frame_raw(frame: RBTFrame, output_dir: str):
             f.write(cel.pixels)
 
 
-def save_audio_wav(frames, output_path: str):
+def decode_audio_track(frames) -> bytes:
     """
-    Decode audio frames and save as 11025 Hz mono 16-bit WAV.
+    Decode the audio packets of `frames` into one 11025 Hz mono 16-bit LE
+    PCM track.
 
     In Robot files every frame's audio_position satisfies audio_position % 4 == 0
     (even channel).  Frames with audio_position % 4 == 2 have overlapping content
     and are skipped to avoid duplicating samples and playing audio at half speed.
 
     Each packet starts with an 8-byte DPCM runway decoded from carry=0 to restore
-    the accumulator to the correct level before the body samples.
+    the accumulator to the correct level before the body samples.  A packet's
+    body runs a few samples past the start of the next even packet (4426
+    samples every 4410 at 5 fps), so each one is written at its own position
+    (audio_position is in 22050 Hz interleaved samples, i.e. bytes of the
+    even-channel track) rather than appended, and the overlap is overwritten.
     """
-    import wave
     samples = bytearray()
+    base = None
     for fr in frames:
         raw = fr.audio_raw
         if not raw or len(raw) <= 8:
@@ -627,13 +1034,27 @@ def save_audio_wav(frames, output_path: str):
             continue
         _, carry = deDPCM16_carry(raw[:8], 0)   # runway → establish carry
         pcm, _  = deDPCM16_carry(raw[8:], carry)  # body → real audio
-        samples += pcm
+        if base is None:
+            base = fr.audio_position
+        at = fr.audio_position - base
+        if at < 0:
+            continue
+        if at > len(samples):
+            samples += bytes(at - len(samples))
+        samples[at:at + len(pcm)] = pcm
+    return bytes(samples)
+
+
+def save_audio_wav(frames, output_path: str):
+    """Decode audio frames (see decode_audio_track) and save as 11025 Hz mono 16-bit WAV."""
+    import wave
+    samples = decode_audio_track(frames)
 
     with wave.open(output_path, 'wb') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(11025)
-        wf.writeframes(bytes(samples))
+        wf.writeframes(samples)
     n = len(samples) // 2
     print(f"  Audio saved: {output_path}  ({n} samples @ 11025 Hz, {n/11025:.1f} s)")
 
@@ -652,30 +1073,37 @@ def parse_frame_spec(spec: str, num_frames: int):
     return {int(spec)}
 
 
-def main():
-    ap = argparse.ArgumentParser(
-        description='Parse a Sierra Robot (.rbt) video file and extract frames.')
-    ap.add_argument('rbt_file',
-                    help='Path to the .rbt file')
-    ap.add_argument('-o', '--output-dir', default='rbt_output',
-                    help='Output directory (default: rbt_output)')
-    ap.add_argument('--frames', default='all',
-                    help='Frames to extract: "all", a single number N, or a range "A-B"')
-    ap.add_argument('--no-video', action='store_true',
-                    help='Skip frame extraction (print header only)')
-    ap.add_argument('--audio', action='store_true',
-                    help='Decode and save audio as audio.wav')
-    ap.add_argument('--canvas-width',  type=int, default=0,
-                    help='Canvas width in pixels (0 = auto)')
-    ap.add_argument('--canvas-height', type=int, default=0,
-                    help='Canvas height in pixels (0 = auto)')
-    args = ap.parse_args()
+def list_frames(rbt: RobotFile, spec: str = 'all'):
+    """Print one line per frame from the index alone (no frame is decoded)."""
+    frame_set = parse_frame_spec(spec, len(rbt))
+    print(f"\n  {'frame':>6} {'offset':>10} {'video':>7} {'packet':>7} {'audio pos':>10}  cels (x,y w×h @v_scale%)")
+    for n in range(len(rbt)):
+        if frame_set is not None and n not in frame_set:
+            continue
+        cels = '  '.join(f'{x},{y} {w}×{h}' + (f' @{v}%' if v != 100 else '')
+                         for x, y, w, h, v in rbt.cel_rects[n])
+        print(f"  {n:>6} {rbt.record_pos[n]:>10} {rbt.video_sizes[n]:>7} "
+              f"{rbt.packet_sizes[n]:>7} {rbt.audio_positions[n]:>10}  {cels}")
 
-    hdr, palette, frames, record_pos, cue_times, cue_values = parse_rbt(
-        args.rbt_file, verbose=True)
+
+def _extract_frames(task):
+    """Worker: decode `frame_nos` straight from the file and write their PNGs."""
+    rbt_path, use_index, frame_nos, output_dir, canvas_w, canvas_h = task
+    with RobotFile(rbt_path, use_index=use_index) as rbt:
+        compositor = FrameCompositor(canvas_w, canvas_h, rbt.palette)
+        for frame_no in frame_nos:
+            save_frame_png(rbt[frame_no], rbt.palette, output_dir,
+                           canvas_w, canvas_h, compositor)
+    return len(frame_nos)
+
+
+def extract(rbt: RobotFile, args):
+    """Print cue points and write the frames / audio selected by `args`."""
+    hdr = rbt.hdr
 
     # Print active cue points
-    active = [(t, v) for t, v in zip(cue_times, cue_values) if t != -1 and t != 0x7FFFFFFF]
+    active = [(t, v) for t, v in zip(rbt.cue_times, rbt.cue_values)
+              if t != -1 and t != 0x7FFFFFFF]
     if active:
         print(f"\n  Cue points ({len(active)}):")
         for t, v in active[:20]:
@@ -694,22 +1122,78 @@ def main():
     ch = args.canvas_height or (hdr.y_res if hdr.y_res > 0 else 480)
 
     frame_set = parse_frame_spec(args.frames, hdr.num_frames)
+    if frame_set is None:
+        frame_nos = range(hdr.num_frames)
+    else:
+        frame_nos = sorted(n for n in frame_set if 0 <= n < hdr.num_frames)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, len(frame_nos)))
 
     print(f"\nExtracting frames to '{args.output_dir}/' ...")
     extracted = 0
-    for frame in frames:
-        if frame_set is not None and frame.frame_no not in frame_set:
-            continue
-        save_frame_png(frame, palette, args.output_dir, cw, ch)
-        extracted += 1
-        if extracted % 100 == 0:
-            print(f"  {extracted} / {hdr.num_frames} frames written ...")
+    if jobs == 1:
+        compositor = FrameCompositor(cw, ch, rbt.palette)
+        for frame_no in frame_nos:
+            save_frame_png(rbt[frame_no], rbt.palette, args.output_dir, cw, ch,
+                           compositor)
+            extracted += 1
+            if extracted % 100 == 0:
+                print(f"  {extracted} / {len(frame_nos)} frames written ...")
+    else:
+        # Each worker opens the file itself and gets runs of consecutive
+        # frames, so no decoded pixels are ever pickled back to this process.
+        frame_nos = list(frame_nos)
+        batch = max(1, min(100, len(frame_nos) // (jobs * 4)))
+        tasks = [(rbt.filepath, not args.no_index, frame_nos[i:i + batch],
+                  args.output_dir, cw, ch)
+                 for i in range(0, len(frame_nos), batch)]
+        print(f"  Using {jobs} worker processes")
+        with multiprocessing.Pool(jobs) as pool:
+            for done in pool.imap_unordered(_extract_frames, tasks):
+                before = extracted
+                extracted += done
+                if extracted // 100 > before // 100:
+                    print(f"  {extracted} / {len(frame_nos)} frames written ...")
 
     print(f"  Done. {extracted} frame(s) extracted.")
 
     if args.audio:
         wav_path = os.path.join(args.output_dir, 'audio.wav')
-        save_audio_wav(frames, wav_path)
+        save_audio_wav(rbt.iter_audio(), wav_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description='Parse a Sierra Robot (.rbt) video file and extract frames.')
+    ap.add_argument('rbt_file',
+                    help='Path to the .rbt file')
+    ap.add_argument('-o', '--output-dir', default='rbt_output',
+                    help='Output directory (default: rbt_output)')
+    ap.add_argument('--frames', default='all',
+                    help='Frames to extract: "all", a single number N, or a range "A-B"')
+    ap.add_argument('--no-video', action='store_true',
+                    help='Skip frame extraction (print header only)')
+    ap.add_argument('--audio', action='store_true',
+                    help='Decode and save audio as audio.wav')
+    ap.add_argument('--canvas-width',  type=int, default=0,
+                    help='Canvas width in pixels (0 = auto)')
+    ap.add_argument('--canvas-height', type=int, default=0,
+                    help='Canvas height in pixels (0 = auto)')
+    ap.add_argument('-j', '--jobs', type=int, default=1,
+                    help='Worker processes for frame extraction (default: 1; 0 = one per CPU)')
+    ap.add_argument('--list', action='store_true',
+                    help='List every frame (offset, sizes, audio position, cel rectangles) '
+                         'without decoding anything')
+    ap.add_argument('--no-index', action='store_true',
+                    help='Neither read nor write the <file>.index.json sidecar')
+    args = ap.parse_args()
+
+    with RobotFile(args.rbt_file, verbose=True, use_index=not args.no_index) as rbt:
+        if args.list:
+            list_frames(rbt, args.frames)
+        else:
+            extract(rbt, args)
 
 
 if __name__ == '__main__':
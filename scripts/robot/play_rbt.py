@@ -3,7 +3,8 @@ play_rbt.py – Sierra Robot (.rbt) video player
 
 Plays an RBT file directly, replicating how ScummVM renders it:
   • 8-bit palettised frames composited from per-frame cels
-  • Sierra SOL DPCM-16 audio decoded to PCM and played via pygame.mixer
+  • Sierra SOL DPCM-16 audio decoded to PCM and streamed to pygame.mixer
+    in short blocks, so seeking and speed changes start instantly
 
 Usage:
     python play_rbt.py <file.rbt> [options]
@@ -13,6 +14,7 @@ Options:
     --no-audio         Disable audio playback
     --canvas-width  W  Override canvas width  (default: from file header)
     --canvas-height H  Override canvas height (default: from file header)
+    --buffer N         Frames to decode ahead in the background (default: 12)
 
 Controls:
     Space            Pause / Resume
@@ -28,6 +30,7 @@ import sys
 import os
 import argparse
 import array as _array
+import threading
 
 try:
     import pygame
@@ -35,14 +38,14 @@ except ImportError:
     sys.exit("pygame is required:  pip install pygame")
 
 try:
-    from PIL import Image
+    from PIL import Image  # noqa: F401  (FrameCompositor needs it without numpy)
 except ImportError:
     sys.exit("Pillow is required:  pip install Pillow")
 
 # Reuse the parser from the same directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 try:
-    from parse_rbt import parse_rbt, deDPCM16, deDPCM16_carry
+    from parse_rbt import RobotFile, FrameCompositor, decode_audio_track
 except ImportError:
     sys.exit("parse_rbt.py not found – it must be in the same directory as play_rbt.py")
 
@@ -113,61 +116,187 @@ def build_pcm(frames) -> bytes:
     _jointMin mechanism), each frame's DPCM body covers a range that includes
     the previous frame's tail.  The non-overlapping new content per frame is
     exactly half the block size.  Even-numbered frames (by frame index, not
-    audio_position parity) have non-overlapping bodies when extracted directly,
-    so decoding them yields the full audio track.
+    audio_position parity) have nearly non-overlapping bodies: each one runs
+    16 samples into the next, so decode_audio_track places every body at its
+    audio position instead of appending it.
 
     Concretely for 912.RBT (76 frames, 5 fps):
-        38 even frames × 4426 body bytes = 168,188 samples / 11025 Hz = 15.26 s ✓
+        37 even frames × 4410 new samples + 4426 = 167,596 samples / 11025 Hz = 15.2 s ✓
 
     Each packet starts with an 8-byte DPCM runway.  ScummVM decodes each packet
     independently from carry=0, relying on the runway to restore the accumulator
     to the correct level.  We must do the same.
     """
-    out = bytearray()
-    for fr in frames:
-        raw = fr.audio_raw
-        if not raw or len(raw) <= 8:
-            continue
-        # Skip odd-indexed frames (audio_position % 4 == 2).
-        # These frames' audio overlaps with adjacent even-indexed frames and
-        # is not needed for a faithful mono reconstruction.
-        if fr.audio_position % 4 == 2:
-            continue
-        # Process the 8-byte runway from carry=0 to establish the correct
-        # initial DPCM accumulator state, then decode the body from there.
-        _, carry = deDPCM16_carry(raw[:8], 0)
-        pcm, _  = deDPCM16_carry(raw[8:], carry)
-        out += pcm
-    return bytes(out)
+    return decode_audio_track(frames)
 
 
+class AudioStreamer:
+    """
+    Plays the decoded PCM track through one reserved mixer channel in short
+    blocks, resampling each block only when it is about to be queued.
+
+    start() stops the channel and begins at the sample for a given frame and
+    speed, so seeking or changing speed costs one block of work instead of
+    resampling the whole track.  pump() must be called from the main loop; it
+    keeps one block playing and the next one queued on the channel.
+
+    Speed works like the old whole-track approach: adapt_pcm is told the
+    source rate is 11025*speed, so a block of 11025*speed*block_secs source
+    samples comes out as block_secs of audio at the mixer's rate, with
+    proportional pitch change.
+    """
+
+    SRC_RATE = 11025
+
+    def __init__(self, pcm: bytes, fps: float, mixer_freq: int, mixer_channels: int,
+                 block_ms: int = 250):
+        self.pcm      = pcm
+        self.fps      = fps
+        self.freq     = mixer_freq
+        self.channels = mixer_channels
+        self.block_ms = block_ms
+        self.speed    = 1.0
+        self._pos     = len(pcm) // 2        # next source sample to queue
+        self._paused  = False
+        pygame.mixer.set_reserved(1)
+        self.channel  = pygame.mixer.Channel(0)
+
+    def _next_block(self):
+        """Resample the block at the current position into a Sound, or None at the end."""
+        n_samples = len(self.pcm) // 2
+        if self._pos >= n_samples:
+            return None
+        src_rate = max(1, int(self.SRC_RATE * self.speed))
+        count    = max(1, src_rate * self.block_ms // 1000)
+        chunk    = self.pcm[self._pos * 2:(self._pos + count) * 2]
+        self._pos += count
+        adapted = adapt_pcm(chunk, src_rate=src_rate,
+                            dst_rate=self.freq, dst_channels=self.channels)
+        if not adapted:
+            return None
+        try:
+            return pygame.mixer.Sound(buffer=adapted)
+        except pygame.error:
+            return None
+
+    def start(self, frame_no: int, speed: float):
+        """(Re)start playback at the audio position of frame_no at the given speed."""
+        self.channel.stop()
+        self.speed   = speed
+        self._pos    = max(0, int(frame_no / self.fps * self.SRC_RATE))
+        self._paused = False
+        self.pump()
+
+    def pump(self):
+        """Keep one block playing and the next one queued."""
+        if self._paused:
+            return
+        if not self.channel.get_busy():
+            sound = self._next_block()
+            if sound is None:
+                return
+            self.channel.play(sound)
+        if self.channel.get_queue() is None:
+            sound = self._next_block()
+            if sound is not None:
+                self.channel.queue(sound)
+
+    def pause(self):
+        self._paused = True
+        self.channel.pause()
+
+    def stop(self):
+        self._paused = False
+        self._pos    = len(self.pcm) // 2
+        self.channel.stop()
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Frame rendering helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def composite_frame(frame, flat_pal: list, canvas_w: int, canvas_h: int) -> pygame.Surface:
+def rgb_surface(rgb, canvas_w: int, canvas_h: int) -> pygame.Surface:
     """
-    Composite all cels of `frame` onto a PIL canvas using `flat_pal` (768-element
-    flat RGB list), then return a pygame.Surface suitable for blitting.
+    Turn packed RGB pixels (e.g. from FrameCompositor.rgb) into a
+    pygame.Surface suitable for blitting.  Must run on the main thread.
     """
-    canvas = Image.new('P', (canvas_w, canvas_h), 0)
-    canvas.putpalette(flat_pal)
+    # convert() copies the pixels, so the source buffer can be reused.
+    return pygame.image.frombuffer(rgb, (canvas_w, canvas_h), 'RGB').convert()
+
 
-    for cel in frame.cels:
-        if not cel.pixels or cel.width <= 0 or cel.height <= 0:
-            continue
-        needed = cel.width * cel.height
-        pix    = cel.pixels[:needed].ljust(needed, b'\x00')
-        cel_img = Image.frombytes('P', (cel.width, cel.height), pix)
-        cel_img.putpalette(flat_pal)
-        x = max(0, cel.x)
-        y = max(0, cel.y)
-        if x < canvas_w and y < canvas_h:
-            canvas.paste(cel_img, (x, y))
+class FramePrefetcher:
+    """
+    Decodes and composites frames on a background thread, up to `ahead`
+    frames past the one being shown, into RGB buffers keyed by frame
+    number.  The pygame loop takes them with get(); asking for a frame
+    outside the buffered window (a seek, or playback outrunning the
+    decoder) flushes the buffer and restarts decoding from that frame.
+
+    Only raw RGB bytes cross the thread boundary: pygame Surfaces are made
+    on the main thread by the caller.
+    """
 
-    rgb_bytes = canvas.convert('RGB').tobytes()
-    return pygame.image.frombuffer(rgb_bytes, (canvas_w, canvas_h), 'RGB').convert()
+    def __init__(self, rbt, compositor: FrameCompositor, ahead: int = 12):
+        self.rbt        = rbt
+        self.compositor = compositor
+        self.ahead      = max(1, ahead)
+        self._cond      = threading.Condition()
+        self._buffer    = {}      # frame_no -> RGB bytes
+        self._next      = 0       # next frame the thread will decode
+        self._gen       = 0       # bumped by seek(); stale decodes are dropped
+        self._stop      = False
+        self._thread    = threading.Thread(target=self._run, name='rbt-decode', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        num_frames = len(self.rbt)
+        while True:
+            with self._cond:
+                while not self._stop and (len(self._buffer) >= self.ahead
+                                          or self._next >= num_frames):
+                    self._cond.wait()
+                if self._stop:
+                    return
+                frame_no, gen = self._next, self._gen
+
+            rgb = bytes(self.compositor.rgb(self.rbt[frame_no]))
+
+            with self._cond:
+                if gen == self._gen:
+                    self._buffer[frame_no] = rgb
+                    self._next = frame_no + 1
+                    self._cond.notify_all()
+
+    def seek(self, frame_no: int):
+        """Flush the buffer and decode onwards from `frame_no`."""
+        with self._cond:
+            self._buffer.clear()
+            self._next = max(0, min(frame_no, len(self.rbt) - 1))
+            self._gen += 1
+            self._cond.notify_all()
+
+    def get(self, frame_no: int, timeout: float = None):
+        """
+        Return the RGB bytes of `frame_no`, waiting up to `timeout` seconds
+        (None = until decoded); None if it is not ready in time.  Frames
+        before `frame_no` are discarded.
+        """
+        with self._cond:
+            for n in [n for n in self._buffer if n < frame_no]:
+                del self._buffer[n]
+            if frame_no not in self._buffer and not (
+                    self._next <= frame_no < self._next + self.ahead):
+                self.seek(frame_no)
+            self._cond.wait_for(lambda: frame_no in self._buffer, timeout)
+            rgb = self._buffer.pop(frame_no, None)
+            self._cond.notify_all()
+            return rgb
+
+    def close(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -204,29 +333,26 @@ def main():
                     help='Playback speed multiplier (default: 1.0, e.g. 0.5=half, 2.0=double)')
     ap.add_argument('--subtitle', action='store_true',
                     help='Enable subtitle cue recording and write <rbt>.txt')
+    ap.add_argument('--buffer', type=int, default=12,
+                    help='Frames to decode ahead in the background (default: 12)')
     args = ap.parse_args()
 
-    # ── Parse RBT ─────────────────────────────────────────────────────────────
+    # ── Open RBT (frames are decoded on demand) ───────────────────────────────
     print(f'Loading {args.rbt_file} ...')
-    hdr, palette, frames, _, _, _ = parse_rbt(args.rbt_file, verbose=True)
+    rbt = RobotFile(args.rbt_file, verbose=True)
+    hdr, palette = rbt.hdr, rbt.palette
 
-    if not frames:
+    if not len(rbt):
         sys.exit('No frames found in the RBT file.')
 
     fps      = hdr.frame_rate or 15
     canvas_w = args.canvas_width  or (hdr.x_res  if hdr.x_res  > 0 else 640)
     canvas_h = args.canvas_height or (hdr.y_res  if hdr.y_res  > 0 else 480)
-    num_frames = len(frames)
-
-    # Build flat 768-byte palette list for PIL
-    if palette:
-        flat_pal = []
-        for r, g, b in palette:
-            flat_pal += [r, g, b]
-        flat_pal += [0] * max(0, 768 - len(flat_pal))
-    else:
-        # Greyscale fallback
-        flat_pal = [v for v in range(256) for _ in range(3)]
+    num_frames = len(rbt)
+
+    # One canvas + palette lookup table for every frame (greyscale if the
+    # file has no palette)
+    compositor = FrameCompositor(canvas_w, canvas_h, palette)
 
     frame_ms = 1000.0 / fps   # base ms-per-frame at 1× speed
 
@@ -234,7 +360,7 @@ def main():
     pcm = b''
     if hdr.has_audio and not args.no_audio:
         print('Decoding audio ...')
-        pcm = build_pcm(frames)
+        pcm = build_pcm(rbt.iter_audio())
         if pcm:
             # len(pcm) is output bytes from deDPCM16; each int16 sample = 2 bytes
             n_samples = len(pcm) // 2
@@ -252,44 +378,16 @@ def main():
 
     pygame.init()
 
-    actual_freq, actual_size, actual_ch = 11025, -16, 1
-    audio_sound = None
+    audio = None
     if pcm:
         try:
             actual_freq, actual_size, actual_ch = pygame.mixer.get_init()
             print(f'  Mixer: {actual_freq} Hz  {abs(actual_size)}-bit  '
                   f'{"stereo" if actual_ch == 2 else "mono"}')
-
-            audio_pcm = adapt_pcm(pcm, src_rate=11025,
-                                  dst_rate=actual_freq, dst_channels=actual_ch)
-            audio_sound = pygame.mixer.Sound(buffer=audio_pcm)
-        except pygame.error as e:
+            audio = AudioStreamer(pcm, fps, actual_freq, actual_ch)
+        except (pygame.error, TypeError) as e:
             print(f'  WARNING: audio init failed ({e}); continuing without audio')
-            audio_sound = None
-
-    def make_audio_sound(from_frame: int, spd: float):
-        """
-        Build a pygame Sound starting at the audio position for from_frame,
-        resampled to play at spd× speed (with proportional pitch change).
-
-        Trick: tell adapt_pcm the source rate is 11025*spd.  The resampler
-        then produces N/spd output samples, which pygame plays at actual_freq
-        → the audio lasts (original duration)/spd seconds, matching the video.
-        """
-        if not pcm:
-            return None
-        sample_offset = max(0, int(from_frame / fps * 11025))
-        pcm_slice = pcm[sample_offset * 2:]
-        if not pcm_slice:
-            return None
-        try:
-            adapted = adapt_pcm(pcm_slice,
-                                src_rate=max(1, int(11025 * spd)),
-                                dst_rate=actual_freq,
-                                dst_channels=actual_ch)
-            return pygame.mixer.Sound(buffer=adapted)
-        except pygame.error:
-            return None
+            audio = None
 
     disp_w = max(1, int(canvas_w * args.scale))
     disp_h = max(1, int(canvas_h * args.scale))
@@ -300,22 +398,30 @@ def main():
     clock = pygame.time.Clock()
     font  = pygame.font.SysFont('monospace', 14)
 
-    # ── Pre-render all frames ─────────────────────────────────────────────────
-    # Composite every frame to a pygame Surface once so the playback loop only
-    # needs a fast blit rather than per-frame PIL work.
-    print(f'Pre-rendering {num_frames} frames ...')
-    surfaces = []
-    bar_width = 40
-    for i, fr in enumerate(frames):
-        surf = composite_frame(fr, flat_pal, canvas_w, canvas_h)
+    # ── Frame surfaces ────────────────────────────────────────────────────────
+    # A background thread decodes a few frames ahead; only the frame on
+    # screen is kept as a Surface.
+    prefetcher = FramePrefetcher(rbt, compositor, args.buffer)
+    shown_no   = -1
+    shown_surf = None
+
+    def frame_surface(frame_no: int, wait: bool) -> pygame.Surface:
+        """
+        Surface for frame_no.  While playing (wait=False) the previous
+        frame stays up if the decoder has not caught up yet.
+        """
+        nonlocal shown_no, shown_surf
+        if frame_no == shown_no:
+            return shown_surf
+        timeout = None if wait or shown_surf is None else effective_frame_ms() / 1000.0
+        rgb = prefetcher.get(frame_no, timeout)
+        if rgb is None:
+            return shown_surf
+        surf = rgb_surface(rgb, canvas_w, canvas_h)
         if args.scale != 1.0:
             surf = pygame.transform.smoothscale(surf, (disp_w, disp_h))
-        surfaces.append(surf)
-        # Simple terminal progress bar
-        done = int(bar_width * (i + 1) / num_frames)
-        bar  = '#' * done + '-' * (bar_width - done)
-        print(f'\r  [{bar}] {i + 1}/{num_frames}', end='', flush=True)
-    print()   # newline after progress bar
+        shown_no, shown_surf = frame_no, surf
+        return surf
 
     print(f'\nPlaying {num_frames} frames @ {fps} fps  ({canvas_w}×{canvas_h})  speed={args.speed}×')
     print('Controls:  Space=mark   P=pause   [/]=speed   Left/Right=step   R=restart   Q/Esc=quit\n')
@@ -334,49 +440,28 @@ def main():
     paused         = False
     speed          = max(0.1, args.speed)
     play_start_ms  = pygame.time.get_ticks()   # ticks when frame 0 was shown
-    audio_channel  = None
-    cur_audio_sound = make_audio_sound(0, speed)  # speed-adjusted sound from frame 0
 
     def effective_frame_ms():
         return frame_ms / speed
 
     def audio_play_from(frame_no: int):
         """Start (or restart) audio from frame_no at the current speed."""
-        nonlocal audio_channel, cur_audio_sound
-        if audio_channel:
-            try:
-                audio_channel.stop()
-            except Exception:
-                pass
-        cur_audio_sound = make_audio_sound(frame_no, speed)
-        if cur_audio_sound:
-            audio_channel = cur_audio_sound.play()
+        if audio:
+            audio.start(frame_no, speed)
 
     def audio_pause():
-        if audio_channel:
-            try:
-                audio_channel.pause()
-            except Exception:
-                pass
-
-    def audio_unpause():
-        if audio_channel:
-            try:
-                audio_channel.unpause()
-            except Exception:
-                pass
+        if audio:
+            audio.pause()
 
     def audio_stop():
-        if audio_channel:
-            try:
-                audio_channel.stop()
-            except Exception:
-                pass
+        if audio:
+            audio.stop()
 
     def restart():
         nonlocal current_frame, paused, play_start_ms
         current_frame = 0
         paused        = False
+        prefetcher.seek(0)
         play_start_ms = pygame.time.get_ticks()
         audio_play_from(0)
 
@@ -384,6 +469,7 @@ def main():
         """Change speed and resample audio from the current frame position."""
         nonlocal speed, play_start_ms
         speed = max(0.1, min(8.0, round(new_speed, 2)))
+        prefetcher.seek(current_frame)
         play_start_ms = pygame.time.get_ticks() - int(current_frame * effective_frame_ms())
         if not paused:
             audio_play_from(current_frame)
@@ -421,7 +507,7 @@ def main():
                     else:
                         # Recalculate the logical start time so elapsed → current frame
                         play_start_ms = pygame.time.get_ticks() - int(current_frame * effective_frame_ms())
-                        audio_unpause()
+                        audio_play_from(current_frame)
 
                 elif key == pygame.K_LEFTBRACKET:
                     set_speed(speed - 0.25)
@@ -451,9 +537,11 @@ def main():
                 paused = True
                 audio_stop()
                 current_frame = num_frames - 1
+            elif audio:
+                audio.pump()
 
         # ── Display ───────────────────────────────────────────────────────────
-        screen.blit(surfaces[current_frame], (0, 0))
+        screen.blit(frame_surface(current_frame, wait=paused), (0, 0))
         draw_osd(screen, font, current_frame, num_frames, fps, paused, speed)
         pygame.display.flip()
 
@@ -466,6 +554,8 @@ def main():
     audio_stop()
     if cue_file:
         cue_file.close()
+    prefetcher.close()
+    rbt.close()
     pygame.quit()
 
 
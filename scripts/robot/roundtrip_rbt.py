@@ -0,0 +1,281 @@
+"""
+roundtrip_rbt.py – check that encode_rbt.py reproduces real Robot files.
+
+For each .rbt file, extracts the frames (8-bit palettised PNGs) and the
+audio track (WAV) with parse_rbt.py.  It then re-encodes them with
+`encode_rbt.py --match-rbt` in each compression mode, decodes the result
+and compares it against the original:
+
+    pixels   every composited frame must be index-for-index identical
+    palette  all 256 palette entries must be identical
+    audio    the PCM tracks must have the same length, and their RMS
+             difference (DPCM-16 re-encoding is lossy) must be within
+             --audio-tolerance
+
+It also reports each mode's output size (relative to the original) and
+encode time, so the LZS encoder can be tuned for speed without silently
+breaking playback.  Exits with status 1 if any check fails.
+
+Usage:
+    python roundtrip_rbt.py [<file.rbt> ...] [options]
+
+    With no files, every .rbt under games_assets/ is checked.
+
+Options:
+    --modes LIST           Comma-separated encode modes (default: raw,lzs):
+                             raw          uncompressed cels (encode_rbt.py switches
+                                          to LZS when a frame is too big for that)
+                             lzs          LZS, greedy parse
+                             lzs-lazy     LZS, lazy matching (--lzs-level 1)
+                             lzs-optimal  LZS, optimal parse (--lzs-level 2)
+                             v6           uncompressed cels, forced v6
+    --frames N             Only round-trip the first N frames (default: all)
+    --audio-tolerance RMS  Largest RMS sample difference accepted
+                           (default: 64)
+    --keep DIR             Keep the extracted frames and encoded files in DIR
+                           (default: a temporary directory, removed after)
+    --json FILE            Write the results as JSON to FILE
+    --compare FILE         Compare sizes and encode times against a previous
+                           --json FILE
+
+Example:
+    python scripts/robot/roundtrip_rbt.py games_assets/kq7/911.RBT --frames 30 --modes raw,lzs,lzs-lazy
+"""
+
+import os
+import sys
+import glob
+import json
+import math
+import time
+import array
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from parse_rbt import RobotFile, FrameCompositor, save_frame_png, save_audio_wav, decode_audio_track
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT  = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+MODES = {
+    'raw':         [],
+    'lzs':         ['--lzs'],
+    'lzs-lazy':    ['--lzs', '--lzs-level', '1'],
+    'lzs-optimal': ['--lzs', '--lzs-level', '2'],
+    'v6':          ['--v6'],
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Extract / encode
+# ─────────────────────────────────────────────────────────────────────────────
+
+def canvas_size(rbt: RobotFile):
+    hdr = rbt.hdr
+    return (hdr.x_res if hdr.x_res > 0 else 640,
+            hdr.y_res if hdr.y_res > 0 else 480)
+
+
+def extract(rbt: RobotFile, num_frames: int, frames_dir: str):
+    """Write frames 0 … num_frames-1 as PNGs (and audio.wav) into frames_dir."""
+    os.makedirs(frames_dir, exist_ok=True)
+    cw, ch = canvas_size(rbt)
+    compositor = FrameCompositor(cw, ch, rbt.palette)
+    for frame_no in range(num_frames):
+        save_frame_png(rbt[frame_no], rbt.palette, frames_dir, cw, ch, compositor)
+    if rbt.hdr.has_audio:
+        save_audio_wav((rbt.read_frame(n, video=False) for n in range(num_frames)),
+                       os.path.join(frames_dir, 'audio.wav'))
+
+
+def encode(rbt: RobotFile, frames_dir: str, output: str, mode: str):
+    """Run encode_rbt.py on frames_dir in `mode`; return the seconds it took."""
+    cmd = [sys.executable, os.path.join(SCRIPT_DIR, 'encode_rbt.py'),
+           frames_dir, output,
+           '--fps', str(rbt.hdr.frame_rate),
+           '--match-rbt', rbt.filepath] + MODES[mode]
+    wav = os.path.join(frames_dir, 'audio.wav')
+    if os.path.exists(wav):
+        cmd += ['--audio', wav]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+    secs = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f'encode_rbt.py failed in mode {mode}:\n{proc.stdout}')
+    return secs
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Compare
+# ─────────────────────────────────────────────────────────────────────────────
+
+def pcm_difference(a: bytes, b: bytes):
+    """Return (max_abs, rms) sample difference over the common length."""
+    sa, sb = array.array('h', a), array.array('h', b)
+    if sys.byteorder == 'big':
+        sa.byteswap()
+        sb.byteswap()
+    n = min(len(sa), len(sb))
+    if not n:
+        return 0, 0.0
+    peak = total = 0
+    for x, y in zip(sa[:n], sb[:n]):
+        d = x - y
+        if d < 0:
+            d = -d
+        if d > peak:
+            peak = d
+        total += d * d
+    return peak, math.sqrt(total / n)
+
+
+def compare(orig: RobotFile, path: str, num_frames: int, tolerance: float) -> dict:
+    """Decode the re-encoded file at `path` and compare it against `orig`."""
+    result = {'size': os.path.getsize(path), 'errors': []}
+    errors = result['errors']
+    with RobotFile(path) as new:
+        result['version'] = new.hdr.version
+        if len(new) != num_frames:
+            errors.append(f'{len(new)} frames, expected {num_frames}')
+
+        bad = [i for i, (x, y) in enumerate(zip(orig.palette, new.palette)) if x != y]
+        if bad:
+            errors.append(f'{len(bad)} palette entries differ (first: {bad[0]})')
+
+        cw, ch = canvas_size(orig)
+        comp_a = FrameCompositor(cw, ch)
+        comp_b = FrameCompositor(cw, ch)
+        mismatched = [n for n in range(min(num_frames, len(new)))
+                      if comp_a.indexed(orig[n]) != comp_b.indexed(new[n])]
+        if mismatched:
+            errors.append(f'{len(mismatched)} frames differ (first: {mismatched[0]})')
+
+        if orig.hdr.has_audio:
+            a = decode_audio_track(orig.read_frame(n, video=False) for n in range(num_frames))
+            b = decode_audio_track(new.iter_audio())
+            peak, rms = pcm_difference(a, b)
+            result['audio_max'] = peak
+            result['audio_rms'] = round(rms, 2)
+            if len(a) != len(b):
+                errors.append(f'audio has {len(b) // 2} samples, expected {len(a) // 2}')
+            if rms > tolerance:
+                errors.append(f'audio RMS difference {rms:.1f} > {tolerance}')
+    return result
+
+
+def roundtrip_file(path: str, modes, max_frames: int, tolerance: float, work_dir: str) -> dict:
+    """Extract `path`, re-encode it in every mode and compare; return {mode: result}."""
+    results = {}
+    stem = os.path.splitext(os.path.basename(path))[0]
+    with RobotFile(path) as rbt:
+        num_frames = len(rbt) if max_frames <= 0 else min(len(rbt), max_frames)
+        frames_dir = os.path.join(work_dir, stem)
+        print(f'  Extracting {num_frames} frames ...')
+        extract(rbt, num_frames, frames_dir)
+        for mode in modes:
+            out = os.path.join(work_dir, f'{stem}.{mode}.rbt')
+            try:
+                secs = encode(rbt, frames_dir, out, mode)
+            except RuntimeError as e:
+                results[mode] = {'errors': [str(e)]}
+                continue
+            results[mode] = compare(rbt, out, num_frames, tolerance)
+            results[mode]['seconds'] = round(secs, 3)
+            results[mode]['frames'] = num_frames
+        # Original bytes up to the end of the last frame checked
+        results['_original_size'] = (rbt.record_pos[num_frames] if num_frames < len(rbt)
+                                     else os.path.getsize(path))
+    return results
+
+
+def print_results(results: dict, baseline: dict = None):
+    orig_size = results['_original_size']
+    print(f'  {"mode":<12} {"ver":>3} {"size":>11} {"vs orig":>8} {"time":>8} '
+          f'{"frames/s":>9} {"audio rms":>9}  result' + ('   size/time vs. baseline' if baseline else ''))
+    for mode, r in results.items():
+        if mode.startswith('_'):
+            continue
+        status = 'ok' if not r['errors'] else 'FAIL: ' + '; '.join(r['errors'])
+        if 'size' not in r:
+            print(f'  {mode:<12} {status}')
+            continue
+        line = (f'  {mode:<12} {r["version"]:>3} {r["size"]:>11} {r["size"] / orig_size:>7.2f}x '
+                f'{r["seconds"]:>7.2f}s {r["frames"] / max(r["seconds"], 1e-9):>9.1f} '
+                f'{r.get("audio_rms", 0):>9.2f}  {status}')
+        old = (baseline or {}).get(mode)
+        if old and old.get('size') and old.get('seconds'):
+            line += f'   {r["size"] / old["size"]:.3f}x / {r["seconds"] / old["seconds"]:.2f}x'
+        print(line)
+
+
+def find_rbt_files():
+    pattern = os.path.join(REPO_ROOT, 'games_assets', '**', '*')
+    return sorted(p for p in glob.glob(pattern, recursive=True)
+                  if p.lower().endswith('.rbt') and os.path.isfile(p))
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Round-trip RBT files through parse_rbt and encode_rbt.')
+    ap.add_argument('rbt_files', nargs='*',
+                    help='.rbt files to check (default: every .rbt under games_assets/)')
+    ap.add_argument('--modes', default='raw,lzs',
+                    help=f'Comma-separated encode modes (default: raw,lzs; '
+                         f'choose from {",".join(MODES)})')
+    ap.add_argument('--frames', type=int, default=0,
+                    help='Only round-trip the first N frames of each file (default: all)')
+    ap.add_argument('--audio-tolerance', type=float, default=64.0,
+                    help='Largest RMS audio sample difference accepted (default: 64)')
+    ap.add_argument('--keep', default=None, metavar='DIR',
+                    help='Keep extracted frames and encoded files in DIR')
+    ap.add_argument('--json', default=None, metavar='FILE',
+                    help='Write the results as JSON to FILE')
+    ap.add_argument('--compare', default=None, metavar='FILE',
+                    help='Compare sizes and encode times against a previous --json FILE')
+    args = ap.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        sys.exit(f'Unknown mode(s): {", ".join(unknown)} (choose from {", ".join(MODES)})')
+
+    paths = args.rbt_files or find_rbt_files()
+    if not paths:
+        sys.exit('No .rbt files found.')
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f).get('files', {})
+
+    work_dir = args.keep or tempfile.mkdtemp(prefix='rbt_roundtrip_')
+    os.makedirs(work_dir, exist_ok=True)
+    results = {}
+    failed = False
+    try:
+        for path in paths:
+            name = os.path.basename(path)
+            print(f'\n{path}')
+            results[name] = roundtrip_file(path, modes, args.frames,
+                                           args.audio_tolerance, work_dir)
+            print_results(results[name], baseline.get(name))
+            failed |= any(r['errors'] for m, r in results[name].items()
+                          if not m.startswith('_'))
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'frames': args.frames, 'modes': modes, 'files': results}, f, indent=2)
+        print(f'\nResults written to {args.json}')
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()